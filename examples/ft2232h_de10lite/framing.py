@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+"""Channel framing layer on top of the FT245 byte stream.
+
+Every frame is (multi-byte fields are little-endian):
+
+    | 0xA5 | chan | length (2) | payload (length bytes) | crc16 (2) |
+
+CRC-16/CCITT-FALSE is calculated over chan, length and payload bytes. It is the
+same as binascii.crc_hqx(data, 0xFFFF), so no extra dependencies are needed and
+checksums are calculated by C code over whole buffers.
+
+FPGA side is implemented in hw/frame_demux.sv and hw/frame_mux.sv.
+"""
+
+import binascii
+import struct
+from collections import deque
+from time import time
+
+KiB = 1024
+MiB = KiB * 1024
+
+SYNC = 0xA5
+HEADER = struct.Struct('<BBH')
+TRAILER = struct.Struct('<H')
+OVERHEAD = HEADER.size + TRAILER.size
+MAX_PAYLOAD = 1024  # should be the same as in hw/framed_test.svh
+
+CTRL_CHAN = 0
+DATA_CHAN = 1
+
+
+def _frame_parts(parts, chan, payload, max_payload):
+    """Append headers, payload slices and trailers of the frames to the parts list"""
+    view = memoryview(payload)
+    # empty payload is still sent as a single frame with zero length
+    for offset in range(0, len(view), max_payload) if len(view) else [0]:
+        chunk = view[offset:offset + max_payload]
+        header = HEADER.pack(SYNC, chan, len(chunk))
+        crc = binascii.crc_hqx(chunk, binascii.crc_hqx(header[1:], 0xFFFF))
+        parts += [header, chunk, TRAILER.pack(crc)]
+
+
+def frame(chan, payload, max_payload=MAX_PAYLOAD):
+    """Split payload into frames of the channel and return them as one bytes object"""
+    parts = []
+    _frame_parts(parts, chan, payload, max_payload)
+    return b''.join(parts)
+
+
+class Deframer:
+    """Incremental frame parser.
+
+    Raw chunks of any size are fed in, complete frames are returned as a list of
+    (chan, payload) tuples. Frames with wrong CRC are dropped and counted, garbage
+    between frames is skipped until the next sync byte.
+    """
+
+    def __init__(self, max_payload=MAX_PAYLOAD):
+        self.max_payload = max_payload
+        self.crc_errors = 0
+        self.dropped_bytes = 0
+        self._buf = bytearray()
+
+    def feed(self, chunk):
+        buf = self._buf
+        buf += chunk
+        frames = []
+        pos = 0
+        end = len(buf)
+        with memoryview(buf) as view:
+            while True:
+                start = buf.find(SYNC, pos)
+                if start < 0:
+                    self.dropped_bytes += end - pos
+                    pos = end
+                    break
+                self.dropped_bytes += start - pos
+                pos = start
+                if end - start < HEADER.size:
+                    break
+                _, chan, length = HEADER.unpack_from(buf, start)
+                if length > self.max_payload:
+                    # not a frame start - resync from the next byte
+                    self.dropped_bytes += 1
+                    pos = start + 1
+                    continue
+                payload_end = start + HEADER.size + length
+                if payload_end + TRAILER.size > end:
+                    break
+                (crc,) = TRAILER.unpack_from(buf, payload_end)
+                if binascii.crc_hqx(view[start + 1:payload_end], 0xFFFF) != crc:
+                    self.crc_errors += 1
+                    self.dropped_bytes += 1
+                    pos = start + 1
+                    continue
+                frames.append((chan, bytes(view[start + HEADER.size:payload_end])))
+                pos = payload_end + TRAILER.size
+        del buf[:pos]
+        return frames
+
+
+class Multiplexer:
+    """Per-channel transmit queues, drained in priority order (lower channel first).
+
+    Every pull() starts with the highest priority channel, so a control message
+    waits no longer than one pull() of the data channel.
+    """
+
+    def __init__(self, max_payload=MAX_PAYLOAD):
+        self.max_payload = max_payload
+        self._queues = {}
+
+    def submit(self, chan, payload):
+        self._queues.setdefault(chan, deque()).append(memoryview(payload))
+
+    @property
+    def pending(self):
+        return any(self._queues.values())
+
+    def pull(self, max_bytes):
+        """Return frames with up to max_bytes of payload as one bytes object"""
+        parts = []
+        budget = max_bytes
+        for chan in sorted(self._queues):
+            queue = self._queues[chan]
+            while queue and budget > 0:
+                view = queue[0]
+                n = min(len(view), budget)
+                _frame_parts(parts, chan, view[:n], self.max_payload)
+                budget -= n
+                if n == len(view):
+                    queue.popleft()
+                else:
+                    queue[0] = view[n:]
+        return b''.join(parts)
+
+
+def benchmark(total_bytes=64 * MiB, chunk_len=1 * MiB):
+    """Measure host-side framing costs against raw streaming"""
+    data = bytes(bytearray([i % 256 for i in range(256)])) * (total_bytes // 256)
+
+    start_time = time()
+    raw = b''.join([data[offset:offset + chunk_len] for offset in range(0, total_bytes, chunk_len)])
+    raw_time = time() - start_time
+
+    mux = Multiplexer()
+    mux.submit(DATA_CHAN, data)
+    start_time = time()
+    framed = []
+    while mux.pending:
+        framed.append(mux.pull(chunk_len))
+    frame_time = time() - start_time
+
+    deframer = Deframer()
+    start_time = time()
+    payloads = []
+    for chunk in framed:
+        payloads += [payload for chan, payload in deframer.feed(chunk)]
+    deframe_time = time() - start_time
+
+    framed_len = sum(len(chunk) for chunk in framed)
+    total_mb = total_bytes / MiB
+    print("Framing overhead: %d bytes per %d bytes of payload (%.02f%%)" %
+          (OVERHEAD, MAX_PAYLOAD, 100 * (framed_len - total_bytes) / total_bytes))
+    print("Raw copy: %.02f MiB in %f seconds (%.02f MiB/s)" % (total_mb, raw_time, total_mb / raw_time))
+    print("Framing: %.02f MiB in %f seconds (%.02f MiB/s)" % (total_mb, frame_time, total_mb / frame_time))
+    print("Deframing: %.02f MiB in %f seconds (%.02f MiB/s)" % (total_mb, deframe_time, total_mb / deframe_time))
+    print("Verify data: %s" % ('ok' if b''.join(payloads) == raw else 'error'))
+
+
+if __name__ == "__main__":
+    benchmark()
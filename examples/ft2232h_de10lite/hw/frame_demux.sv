@@ -0,0 +1,146 @@
+//------------------------------------------------------------------------------
+// Channel framing layer: demultiplexer.
+//
+// Parses the framed byte stream coming from the host:
+//
+//   | 0xA5 | chan | length (2, LE) | payload (length bytes) | crc16 (2, LE) |
+//
+// CRC-16/CCITT-FALSE is calculated over chan, length and payload bytes.
+// Payload bytes are forwarded as soon as they arrive, so CRC result is known
+// only at the end of the frame (out_last). Bytes between frames, which do not
+// match the sync byte, are dropped. Sink must accept one byte per clock.
+//------------------------------------------------------------------------------
+module frame_demux #(
+    parameter MAX_PAYLOAD = 1024 // Longer frames are treated as lost sync
+)(
+    input  logic       clk,        // Clock
+    input  logic       rst,        // Active high synchronous reset
+    // Framed stream
+    input  logic [7:0] in_data,    // Framed stream data
+    input  logic       in_valid,   // Framed stream data is valid
+    // Payload stream
+    output logic [7:0] out_chan,   // Channel of the current frame
+    output logic [7:0] out_data,   // Payload data
+    output logic       out_valid,  // Payload data is valid
+    output logic       out_last,   // Frame is finished (no payload data at this cycle)
+    output logic       out_crc_ok  // Frame CRC is correct (valid with out_last)
+);
+
+`include "crc.svh"
+
+localparam SYNC_BYTE = 8'hA5;
+
+enum logic [2:0] {
+    SYNC_S,
+    CHAN_S,
+    LEN_LO_S,
+    LEN_HI_S,
+    PAYLOAD_S,
+    CRC_LO_S,
+    CRC_HI_S
+} fsm_state, fsm_next;
+
+logic [15:0] len_cnt, len_cnt_next;
+logic [15:0] crc, crc_next;
+logic [7:0] crc_lo, crc_lo_next;
+logic [7:0] chan_next;
+logic [7:0] data_next;
+logic valid_next;
+logic last_next;
+logic crc_ok_next;
+
+always_comb begin
+    fsm_next     = fsm_state;
+    len_cnt_next = len_cnt;
+    crc_next     = crc;
+    crc_lo_next  = crc_lo;
+    chan_next    = out_chan;
+    data_next    = out_data;
+    valid_next   = 1'b0;
+    last_next    = 1'b0;
+    crc_ok_next  = out_crc_ok;
+
+    if (in_valid) begin
+        case (fsm_state)
+            SYNC_S: begin
+                if (in_data == SYNC_BYTE) begin
+                    crc_next = 16'hFFFF;
+                    fsm_next = CHAN_S;
+                end
+            end
+
+            CHAN_S: begin
+                chan_next = in_data;
+                crc_next  = crc16_update(crc, in_data);
+                fsm_next  = LEN_LO_S;
+            end
+
+            LEN_LO_S: begin
+                len_cnt_next = {8'h00, in_data};
+                crc_next     = crc16_update(crc, in_data);
+                fsm_next     = LEN_HI_S;
+            end
+
+            LEN_HI_S: begin
+                len_cnt_next = {in_data, len_cnt[7:0]};
+                crc_next     = crc16_update(crc, in_data);
+                if (len_cnt_next > MAX_PAYLOAD)
+                    fsm_next = SYNC_S;
+                else if (len_cnt_next == 0)
+                    fsm_next = CRC_LO_S;
+                else
+                    fsm_next = PAYLOAD_S;
+            end
+
+            PAYLOAD_S: begin
+                data_next    = in_data;
+                valid_next   = 1'b1;
+                crc_next     = crc16_update(crc, in_data);
+                len_cnt_next = len_cnt - 1'b1;
+                if (len_cnt == 1)
+                    fsm_next = CRC_LO_S;
+            end
+
+            CRC_LO_S: begin
+                crc_lo_next = in_data;
+                fsm_next    = CRC_HI_S;
+            end
+
+            CRC_HI_S: begin
+                last_next   = 1'b1;
+                crc_ok_next = ({in_data, crc_lo} == crc);
+                fsm_next    = SYNC_S;
+            end
+
+            default: begin
+                fsm_next = SYNC_S;
+            end
+        endcase
+    end
+end
+
+always_ff @(posedge clk) begin
+    if (rst) begin
+        fsm_state  <= SYNC_S;
+        len_cnt    <= '0;
+        crc        <= '1;
+        crc_lo     <= '0;
+        out_chan   <= '0;
+        out_data   <= '0;
+        out_valid  <= 1'b0;
+        out_last   <= 1'b0;
+        out_crc_ok <= 1'b0;
+    end else begin
+        fsm_state  <= fsm_next;
+        len_cnt    <= len_cnt_next;
+        crc        <= crc_next;
+        crc_lo     <= crc_lo_next;
+        out_chan   <= chan_next;
+        out_data   <= data_next;
+        out_valid  <= valid_next;
+        out_last   <= last_next;
+        out_crc_ok <= crc_ok_next;
+    end
+end
+
+endmodule
@@ -0,0 +1,157 @@
+//------------------------------------------------------------------------------
+// Channel framing layer: multiplexer.
+//
+// Builds frames (see frame_demux.sv for the format) from several channel
+// sources. Arbitration happens at frame boundaries and the lowest channel
+// index always wins, so a pending low-index channel waits no longer than one
+// frame of MAX_PAYLOAD bytes of any other channel.
+//
+// Source protocol: src_req means that at least src_len bytes can be read
+// back-to-back, src_data is the current byte, and src_rd pulse consumes it.
+// Output follows the FIFO write protocol: byte is accepted when out_wr is
+// high and out_full is low.
+//------------------------------------------------------------------------------
+module frame_mux #(
+    parameter CHAN_N      = 2,   // Number of channels
+    parameter MAX_PAYLOAD = 1024 // Maximum payload size of a single frame
+)(
+    input  logic                    clk,      // Clock
+    input  logic                    rst,      // Active high synchronous reset
+    // Channel sources
+    input  logic [CHAN_N-1:0]       src_req,  // Channel has data to send
+    input  logic [CHAN_N-1:0][15:0] src_len,  // Bytes available to send (non zero with src_req)
+    input  logic [CHAN_N-1:0][7:0]  src_data, // Current byte
+    output logic [CHAN_N-1:0]       src_rd,   // Current byte is consumed
+    // Framed stream
+    output logic [7:0]              out_data, // Framed stream data
+    output logic                    out_wr,   // Framed stream write enable
+    input  logic                    out_full  // Framed stream sink is full
+);
+
+`include "crc.svh"
+
+localparam SYNC_BYTE = 8'hA5;
+localparam CHAN_W    = (CHAN_N > 1) ? $clog2(CHAN_N) : 1;
+
+enum logic [2:0] {
+    IDLE_S,
+    CHAN_S,
+    LEN_LO_S,
+    LEN_HI_S,
+    PAYLOAD_S,
+    CRC_LO_S,
+    CRC_HI_S
+} fsm_state, fsm_next;
+
+logic [CHAN_W-1:0] chan, chan_next;
+logic [CHAN_W-1:0] grant;
+logic [15:0] len, len_next;
+logic [15:0] len_cnt, len_cnt_next;
+logic [15:0] crc, crc_next;
+logic [7:0] data_next;
+logic wr_next;
+logic advance;
+
+// output register is free to take the next byte
+assign advance = !out_wr || !out_full;
+
+always_comb begin
+    grant = '0;
+    for (int i = CHAN_N - 1; i >= 0; i--) begin
+        if (src_req[i])
+            grant = CHAN_W'(i);
+    end
+end
+
+always_comb begin
+    fsm_next     = fsm_state;
+    chan_next    = chan;
+    len_next     = len;
+    len_cnt_next = len_cnt;
+    crc_next     = crc;
+    data_next    = out_data;
+    wr_next      = out_wr;
+    src_rd       = '0;
+
+    if (advance) begin
+        wr_next = 1'b1;
+        case (fsm_state)
+            IDLE_S: begin
+                if (|src_req) begin
+                    chan_next = grant;
+                    len_next  = (src_len[grant] > MAX_PAYLOAD) ? 16'(MAX_PAYLOAD) : src_len[grant];
+                    data_next = SYNC_BYTE;
+                    crc_next  = 16'hFFFF;
+                    fsm_next  = CHAN_S;
+                end else begin
+                    wr_next = 1'b0;
+                end
+            end
+
+            CHAN_S: begin
+                data_next = 8'(chan);
+                crc_next  = crc16_update(crc, data_next);
+                fsm_next  = LEN_LO_S;
+            end
+
+            LEN_LO_S: begin
+                data_next = len[7:0];
+                crc_next  = crc16_update(crc, data_next);
+                fsm_next  = LEN_HI_S;
+            end
+
+            LEN_HI_S: begin
+                data_next    = len[15:8];
+                crc_next     = crc16_update(crc, data_next);
+                len_cnt_next = len;
+                fsm_next     = (len == 0) ? CRC_LO_S : PAYLOAD_S;
+            end
+
+            PAYLOAD_S: begin
+                data_next    = src_data[chan];
+                src_rd[chan] = 1'b1;
+                crc_next     = crc16_update(crc, data_next);
+                len_cnt_next = len_cnt - 1'b1;
+                if (len_cnt == 1)
+                    fsm_next = CRC_LO_S;
+            end
+
+            CRC_LO_S: begin
+                data_next = crc[7:0];
+                fsm_next  = CRC_HI_S;
+            end
+
+            CRC_HI_S: begin
+                data_next = crc[15:8];
+                fsm_next  = IDLE_S;
+            end
+
+            default: begin
+                wr_next  = 1'b0;
+                fsm_next = IDLE_S;
+            end
+        endcase
+    end
+end
+
+always_ff @(posedge clk) begin
+    if (rst) begin
+        fsm_state <= IDLE_S;
+        chan      <= '0;
+        len       <= '0;
+        len_cnt   <= '0;
+        crc       <= '1;
+        out_data  <= '0;
+        out_wr    <= 1'b0;
+    end else begin
+        fsm_state <= fsm_next;
+        chan      <= chan_next;
+        len       <= len_next;
+        len_cnt   <= len_cnt_next;
+        crc       <= crc_next;
+        out_data  <= data_next;
+        out_wr    <= wr_next;
+    end
+end
+
+endmodule
@@ -68,6 +68,8 @@ if {$make_assignments} {
 	set_global_assignment -name SYSTEMVERILOG_FILE ../../../src/fifo_sync.sv
 	set_global_assignment -name SYSTEMVERILOG_FILE ../../../src/fifo_async.sv
 	set_global_assignment -name SYSTEMVERILOG_FILE ../../../src/dpram.sv
+	set_global_assignment -name SYSTEMVERILOG_FILE frame_demux.sv
+	set_global_assignment -name SYSTEMVERILOG_FILE frame_mux.sv
 	set_global_assignment -name SYSTEMVERILOG_FILE top.sv
 	set_global_assignment -name SDC_FILE top.sdc
 	set_global_assignment -name POWER_PRESET_COOLING_SOLUTION "23 MM HEAT SINK WITH 200 LFPM AIRFLOW"
@@ -61,143 +61,13 @@ end
 //------------------------------------------------------------------------------
 // Test logic
 //------------------------------------------------------------------------------
-enum logic [3:0] {
-    CMD_WAIT_S,
-    CMD_READ_S,
-    CMD_PARSE_S,
-    TX_TEST_S,
-    RX_TEST_S
-} fsm_state, fsm_next;
+//`define FRAMED_CHANNELS
 
-logic [63:0] cmd_shifter, cmd_shifter_next;
-logic [7:0] cmd_prefix;
-logic [7:0] cmd_suffix;
-logic [31:0] cmd_data;
-logic [15:0] cmd_code;
-logic rxfifo_rd_next;
-logic [DATA_W-1:0] txfifo_data_next;
-logic txfifo_wr_next;
-logic led0_drv, led0_drv_next;
-logic [31:0] word_cnt, word_cnt_next;
-logic [DATA_W-1:0] golden_data, golden_data_next;
-logic dbg_led, dbg_led_next;
-
-assign {cmd_prefix, cmd_code, cmd_data, cmd_suffix} = cmd_shifter;
-
-always_comb begin
-    fsm_next         = fsm_state;
-    cmd_shifter_next = cmd_shifter;
-    rxfifo_rd_next   = rxfifo_rd;
-    txfifo_data_next = txfifo_data;
-    txfifo_wr_next   = txfifo_wr;
-    led0_drv_next    = led0_drv;
-    word_cnt_next    = word_cnt;
-    golden_data_next = golden_data;
-    dbg_led_next     = dbg_led;
-
-    case (fsm_state)
-        CMD_WAIT_S: begin
-            txfifo_wr_next = 1'b0;
-            rxfifo_rd_next = 1'b0;
-            if (!rxfifo_empty) begin
-                rxfifo_rd_next = 1'b1;
-                fsm_next       = CMD_READ_S;
-            end
-        end
-
-        CMD_READ_S: begin
-            rxfifo_rd_next = 1'b0;
-            if (rxfifo_valid) begin
-                cmd_shifter_next = {rxfifo_data, cmd_shifter[63:DATA_W]};
-                fsm_next         = CMD_PARSE_S;
-            end
-        end
-
-        CMD_PARSE_S: begin
-            if ((cmd_prefix == 8'hAA) && (cmd_suffix == 8'h55)) begin
-                case (cmd_code)
-                    16'hbeef: begin
-                        cmd_shifter_next = '0;
-                        txfifo_wr_next   = 1'b1;
-                        txfifo_data_next = '0;
-                        word_cnt_next    = cmd_data;
-                        fsm_next         = TX_TEST_S;
-                    end
-                    16'hcafe: begin
-                        cmd_shifter_next = '0;
-                        word_cnt_next    = cmd_data;
-                        golden_data_next = '0;
-                        txfifo_data_next = 8'h42;
-                        fsm_next         = RX_TEST_S;
-                    end
-                    16'h1ed0: begin
-                        cmd_shifter_next = '0;
-                        led0_drv_next    = cmd_data[0];
-                        fsm_next         = CMD_WAIT_S;
-                    end
-                    default: begin
-                        //do nothing
-                    end
-                endcase
-            end else begin
-                fsm_next = CMD_WAIT_S;
-            end
-        end
-
-        TX_TEST_S: begin
-            if (word_cnt == 0) begin
-                txfifo_wr_next = 1'b0;
-                fsm_next       = CMD_WAIT_S;
-            end else if (!txfifo_full) begin
-                word_cnt_next    = word_cnt - 1'b1;
-                txfifo_data_next = txfifo_data + 1'b1;
-            end
-        end
-
-        RX_TEST_S: begin
-            rxfifo_rd_next = !rxfifo_empty;
-            if (rxfifo_valid) begin
-                if (word_cnt == 0) begin
-                    rxfifo_rd_next = 1'b0;
-                    txfifo_wr_next = 1'b1;
-                    fsm_next       = CMD_WAIT_S;
-                end else begin
-                    word_cnt_next = word_cnt - 1'b1;
-                end
-                txfifo_data_next = (rxfifo_data != golden_data) ?  8'hee : txfifo_data;
-                golden_data_next = golden_data + 1'b1;
-            end
-        end
-
-        default: begin
-            //do nothing
-        end
-   endcase
-end
-
-always_ff @(posedge sys_clk) begin
-    if (sys_rst) begin
-        fsm_state   <= CMD_WAIT_S;
-        cmd_shifter <= '0;
-        rxfifo_rd   <= 1'b0;
-        txfifo_data <= '0;
-        txfifo_wr   <= 1'b0;
-        led0_drv    <= 1'b0;
-        word_cnt    <= '0;
-        golden_data <= '0;
-        dbg_led     <= 1'b0;
-    end else begin
-        fsm_state   <= fsm_next;
-        cmd_shifter <= cmd_shifter_next;
-        rxfifo_rd   <= rxfifo_rd_next;
-        txfifo_data <= txfifo_data_next;
-        txfifo_wr   <= txfifo_wr_next;
-        led0_drv    <= led0_drv_next;
-        word_cnt    <= word_cnt_next;
-        golden_data <= golden_data_next;
-        dbg_led     <= dbg_led_next;
-    end
-end
+`ifdef FRAMED_CHANNELS
+    `include "framed_test.svh"
+`else
+    `include "raw_test.svh"
+`endif
 
 `ifdef FIFO245_SYNC
 assign ledr[7] = '0;
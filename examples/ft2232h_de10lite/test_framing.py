@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+from framing import frame, benchmark, Deframer, Multiplexer, CTRL_CHAN, DATA_CHAN
+from test_ftdi1 import FPGA, KiB, MiB
+from time import time, sleep
+import zlib
+
+
+class FramedFPGA(FPGA):
+    """FPGA with FRAMED_CHANNELS test logic: commands go through the control channel"""
+
+    def __init__(self, serial, sync=True, vid=0x0403, pid=0x6010, record=None, replay=None, realtime=False):
+        super().__init__(serial, sync, vid, pid, record, replay, realtime)
+        self._deframer = Deframer()
+
+    def _cmd(self, code, data):
+        cmd = ((0xAA << 56) | (code << 40) | (data << 8) | 0x55).to_bytes(8, 'little')
+        return frame(CTRL_CHAN, cmd)
+
+    def _recv(self, n):
+        """Read raw chunk and return complete frames, or None on timeout"""
+        chunk_len, chunk = self.read(n)
+        return self._deframer.feed(chunk[:chunk_len]) if chunk_len else None
+
+    def _crc(self, stream):
+        """CRC-32 of the data channel payload of the last RX (0) or TX (1) test calculated by FPGA"""
+        self.write(self._cmd(0xC3C2, stream))
+        while True:
+            frames = self._recv(16)
+            if frames is None:
+                return None
+            for chan, payload in frames:
+                if chan == CTRL_CHAN and len(payload) == 4:
+                    return int.from_bytes(payload, 'little')
+
+    def test_led(self):
+        self.write(self._cmd(0x1ED0, 1))
+        sleep(2)
+        self.write(self._cmd(0x1ED0, 0))
+        sleep(2)
+
+    def test_read(self, total_bytes=1 * MiB):
+        # Start read test
+        self.flush()
+        self.write(self._cmd(0xBEEF, total_bytes - 1))
+
+        # Receive data
+        pattern = bytes(bytearray(range(256))) * 5  # covers any payload at any pattern offset
+        data_len = 0
+        errors = 0
+        crc = 0
+        ping_time = None
+        ping_latency = None
+        start_time = time()
+        while data_len < total_bytes or (ping_time is not None and ping_latency is None):
+            frames = self._recv(16 * KiB)
+            if frames is None:
+                break
+            for chan, payload in frames:
+                if chan == DATA_CHAN:
+                    offset = data_len % 256
+                    errors += payload != pattern[offset:offset + len(payload)]
+                    crc = zlib.crc32(payload, crc)
+                    data_len += len(payload)
+                elif chan == CTRL_CHAN and ping_time is not None:
+                    ping_latency = time() - ping_time
+            # ping in the middle of the stream to measure control channel latency
+            if ping_time is None and data_len >= total_bytes // 2:
+                ping_time = time()
+                self.write(self._cmd(0xC0DE, 0x5A))
+        exec_time = time() - start_time
+
+        # Print statistics
+        data_len_mb = data_len / MiB
+        print("Read %.02f MiB (%d bytes) of framed data from FPGA in %f seconds (%.02f MiB/s)" %
+              (data_len_mb, data_len, exec_time, data_len_mb / exec_time))
+        print("Control channel latency during the stream: %s" %
+              ('%.03f ms' % (ping_latency * 1e3) if ping_latency is not None else 'no response'))
+
+        # Verify data
+        ok = (data_len == total_bytes) and not errors and not self._deframer.crc_errors and crc == self._crc(1)
+        print("Verify data: %s" % ('ok' if ok else 'error'))
+
+    def test_write(self, total_bytes=1 * MiB, data=None):
+        # Prepare data - any payload might be provided, it is verified with CRC
+        pattern = data is None
+        if pattern:
+            data = bytes(bytearray([i % 256 for i in range(256)])) * (total_bytes // 256)
+            data += bytes(bytearray([i % 256 for i in range(total_bytes % 256)]))
+        total_bytes = len(data)
+
+        # Start write test
+        self.flush()
+        self.write(self._cmd(0xCAFE, total_bytes - 1))
+
+        # Transmit data
+        mux = Multiplexer()
+        mux.submit(DATA_CHAN, data)
+        result = 0
+        crc = 0
+        offset = 0
+        start_time = time()
+        while mux.pending:
+            self.write(mux.pull(1 * MiB))
+            crc = zlib.crc32(memoryview(data)[offset:offset + 1 * MiB], crc)
+            offset += 1 * MiB
+        while not result:
+            for chan, payload in self._recv(16) or []:
+                if chan == CTRL_CHAN:
+                    result = payload[0]
+        exec_time = time() - start_time
+
+        # Print statistics
+        data_len_mb = total_bytes / MiB
+        print("Wrote %.02f MiB (%d bytes) of framed data to FPGA in %f seconds (%.02f MiB/s)" %
+              (data_len_mb, total_bytes, exec_time, data_len_mb / exec_time))
+
+        # Verify data (FPGA checks the content itself only for the incrementing pattern)
+        ok = (crc == self._crc(0)) and (result == 0x42 or not pattern)
+        print("Verify data: %s" % ('ok' if ok else 'error'))
+
+
+if __name__ == '__main__':
+    # Host side costs of the framing layer
+    benchmark()
+    # FPGA has to be built with FRAMED_CHANNELS define, compare results with test_ftdi1.py
+    with FramedFPGA('FT3C8Z0A') as de10lite:
+        de10lite.test_led()
+        de10lite.test_read(100 * MiB)
+        de10lite.test_write(100 * MiB)
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 import ftd2xx as ft
+import trace245
+import zlib
 from time import time, sleep
 
 KiB = 1024
@@ -8,11 +10,20 @@ MiB = KiB * 1024
 
 
 class FPGA:
-    def __init__(self, ftdi_serial, fifo245_mode):
+    """Session might be recorded to the trace file (record) or served from it without a board (replay),
+    with the original timing (realtime) or as fast as possible - see trace245.py"""
+
+    def __init__(self, ftdi_serial, fifo245_mode, record=None, replay=None, realtime=False):
         self.ftdi_serial = ftdi_serial
         self.fifo245_mode = fifo245_mode
+        self.record = record
+        self.replay = replay
+        self.realtime = realtime
 
     def __enter__(self):
+        if self.replay:
+            self.ftdev = trace245.Replay(self.replay, self.realtime)
+            return self
         try:
             ftdev_id = ft.listDevices().index(self.ftdi_serial)
         except ValueError:
@@ -24,6 +35,8 @@ class FPGA:
         self.ftdev.setTimeouts(10, 10)  # in ms
         self.ftdev.setUSBParameters(64 * KiB, 64 * KiB)  # set rx, tx buffer size in bytes
         self.ftdev.setFlowControl(ft.defines.FLOW_RTS_CTS, 0, 0)
+        if self.record:
+            self.ftdev = trace245.Recorder(self.ftdev, self.record, modem_poll=True)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -32,6 +45,17 @@ class FPGA:
     def __cmd(self, code, data):
         return ((0xAA << 56) | (code << 40) | (data << 8) | 0x55).to_bytes(8, 'little')
 
+    def __crc(self, stream):
+        """CRC-32 of the last RX (0) or TX (1) test stream calculated by FPGA"""
+        self.ftdev.write(self.__cmd(0xC3C2, stream))
+        crc = b''
+        while len(crc) < 4:
+            chunk = self.ftdev.read(4 - len(crc))
+            if not chunk:
+                return None
+            crc += chunk
+        return int.from_bytes(crc, 'little')
+
     def test_led(self):
         self.ftdev.write(self.__cmd(0x1ED0, 1))
         sleep(2)
@@ -39,48 +63,51 @@ class FPGA:
         sleep(2)
 
     def test_read(self, total_bytes=1 * MiB):
-        # Prepare data
-        golden_data = [i % 256 for i in range(total_bytes)]
-
         # Start read test
         self.ftdev.write(self.__cmd(0xBEEF, total_bytes - 1))
 
-        # Receive data
-        chunks = []
+        # Receive data, checksum is updated with every chunk instead of storing the data
+        crc = 0
+        data_len = 0
         start_time = time()
-        while total_bytes > 0:
+        while data_len < total_bytes:
             chunk = self.ftdev.read(1 * MiB)
             if not chunk:
                 break
-            chunks.append(chunk)
-            total_bytes -= len(chunk)
+            crc = zlib.crc32(chunk, crc)
+            data_len += len(chunk)
         exec_time = time() - start_time
 
         # Print statistics
-        data = [b for chunk in chunks for b in chunk]  # flatten all chunks
-        data_len = len(data)
         data_len_mb = data_len / MiB
         print("Read %.02f MiB (%d bytes) from FPGA in %f seconds (%.02f MiB/s)" %
               (data_len_mb, data_len, exec_time, data_len_mb / exec_time))
 
         # Verify data
-        print("Verify data: %s" % ('ok' if golden_data == data else 'error'))
+        ok = (data_len == total_bytes) and (crc == self.__crc(1))
+        print("Verify data: %s" % ('ok' if ok else 'error'))
 
-    def test_write(self, total_bytes=1 * MiB):
-        # Prepare data
-        data = bytes(bytearray([i % 256 for i in range(total_bytes)]))
+    def test_write(self, total_bytes=1 * MiB, data=None):
+        # Prepare data - any payload might be provided, it is verified with CRC
+        pattern = data is None
+        if pattern:
+            data = bytes(bytearray([i % 256 for i in range(total_bytes)]))
+        total_bytes = len(data)
+        view = memoryview(data)
 
         # Start write test
         self.ftdev.write(self.__cmd(0xCAFE, total_bytes - 1))
 
-        # Transmit data
+        # Transmit data, checksum is updated with every chunk written
         offset = 0
         data_len = total_bytes
         result = 0
+        crc = 0
         start_time = time()
         while data_len > 0:
             chunk_len = 1 * MiB if data_len > 1 * MiB else data_len
             chunk_len = self.ftdev.write(data[offset:offset + chunk_len])
+            crc = zlib.crc32(view[offset:offset + chunk_len], crc)
             data_len -= chunk_len
             offset += chunk_len
         result = self.ftdev.read(1)
@@ -91,9 +118,10 @@ class FPGA:
         print("Wrote %.02f MiB (%d bytes) to FPGA in %f seconds (%.02f MiB/s)" %
               (data_len_mb, total_bytes, exec_time, data_len_mb / exec_time))
 
-        # Verify data
+        # Verify data (FPGA checks the content itself only for the incrementing pattern)
         result = 0 if not result else result[0]
-        print("Verify data: %s" % ('ok' if result == 0x42 else 'error'))
+        ok = (crc == self.__crc(0)) and (result == 0x42 or not pattern)
+        print("Verify data: %s" % ('ok' if ok else 'error'))
 
 
 if __name__ == "__main__":
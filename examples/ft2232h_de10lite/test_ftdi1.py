@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 import ftdi1 as ft
+import trace245
+import zlib
 from time import time, sleep
 
 KiB = 1024
@@ -8,11 +10,17 @@ MiB = KiB * 1024
 
 
 class FPGA:
-    def __init__(self, serial, sync=True, vid=0x0403, pid=0x6010):
+    """Session might be recorded to the trace file (record) or served from it without a board (replay),
+    with the original timing (realtime) or as fast as possible - see trace245.py"""
+
+    def __init__(self, serial, sync=True, vid=0x0403, pid=0x6010, record=None, replay=None, realtime=False):
         self._vid = vid
         self._pid = pid
         self._serial = serial
         self._sync = sync
+        self._record = record
+        self._replay = replay
+        self._realtime = realtime
 
     def _err_wrap(self, ret):
         if ret < 0:  # prints last error message
@@ -21,15 +29,23 @@ class FPGA:
             return ret
 
     def __enter__(self):
+        if self._replay:
+            self._trace = trace245.attach(self, replay=self._replay, realtime=self._realtime, tuple_read=True)
+            return self
         self._ctx = ft.new()
         self._err_wrap(ft.init(self._ctx))
         self._err_wrap(ft.usb_open_desc(self._ctx, self._vid, self._pid, None, self._serial))
         self._err_wrap(ft.set_bitmode(self._ctx, 0xff, ft.BITMODE_SYNCFF if self._sync else ft.BITMODE_RESET))
         self._err_wrap(ft.read_data_set_chunksize(self._ctx, 16 * KiB))
         self._err_wrap(ft.write_data_set_chunksize(self._ctx, 16 * KiB))
+        self._trace = trace245.attach(self, record=self._record, tuple_read=True)
         return self
 
     def __exit__(self, type, value, traceback):
+        if self._trace:
+            self._trace.close()
+        if self._replay:
+            return
         self._err_wrap(ft.usb_close(self._ctx))
         ft.deinit(self._ctx)
 
@@ -42,9 +58,28 @@ class FPGA:
         self._err_wrap(bytes_read)
         return (bytes_read, data)
 
+    def flush(self):
+        self._err_wrap(ft.tcioflush(self._ctx))
+
+    def getModemStatus(self):
+        ret, status = ft.poll_modem_status(self._ctx)
+        self._err_wrap(ret)
+        return status
+
     def __cmd(self, code, data):
         return ((0xAA << 56) | (code << 40) | (data << 8) | 0x55).to_bytes(8, 'little')
 
+    def __crc(self, stream):
+        """CRC-32 of the last RX (0) or TX (1) test stream calculated by FPGA"""
+        self.write(self.__cmd(0xC3C2, stream))
+        crc = b''
+        while len(crc) < 4:
+            chunk_len, chunk = self.read(4 - len(crc))
+            if chunk_len == 0:
+                return None
+            crc += chunk[:chunk_len]
+        return int.from_bytes(crc, 'little')
+
     def test_led(self):
         self.write(self.__cmd(0x1ED0, 1))
         sleep(2)
@@ -52,48 +87,53 @@ class FPGA:
         sleep(2)
 
     def test_read(self, total_bytes=1 * MiB):
-        # Prepare data
-        golden_data = [i % 256 for i in range(total_bytes)]
-
         # Start read test
-        self._err_wrap(ft.tcioflush(self._ctx))
+        self.flush()
         self.write(self.__cmd(0xBEEF, total_bytes - 1))
 
-        # Receive data
-        chunks = []
+        # Receive data, checksum is updated with every chunk instead of storing the data
+        crc = 0
+        data_len = 0
         start_time = time()
-        while total_bytes > 0:
-            chunk_len, chunk = self.read(16 * KiB if total_bytes > 16 * KiB else total_bytes)
+        while data_len < total_bytes:
+            chunk_len, chunk = self.read(16 * KiB if total_bytes - data_len > 16 * KiB else total_bytes - data_len)
             if chunk_len == 0:
                 break
             else:
-                chunks.append(chunk[:chunk_len])
-                total_bytes -= chunk_len
+                crc = zlib.crc32(memoryview(chunk)[:chunk_len], crc)
+                data_len += chunk_len
         exec_time = time() - start_time
 
         # Print statistics
-        data = [b for chunk in chunks for b in chunk]  # flatten all chunks
-        # print(data)
-        data_len = len(data)
         data_len_mb = data_len / MiB
         print("Read %.02f MiB (%d bytes) from FPGA in %f seconds (%.02f MiB/s)" %
               (data_len_mb, data_len, exec_time, data_len_mb / exec_time))
 
         # Verify data
-        print("Verify data: %s" % ('ok' if golden_data == data else 'error'))
+        ok = (data_len == total_bytes) and (crc == self.__crc(1))
+        print("Verify data: %s" % ('ok' if ok else 'error'))
 
-    def test_write(self, total_bytes=1 * MiB):
-        # Prepare data
-        data = bytes(bytearray([i % 256 for i in range(total_bytes)]))
+    def test_write(self, total_bytes=1 * MiB, data=None):
+        # Prepare data - any payload might be provided, it is verified with CRC
+        pattern = data is None
+        if pattern:
+            data = bytes(bytearray([i % 256 for i in range(total_bytes)]))
+        total_bytes = len(data)
+        view = memoryview(data)
 
         # Start write test
-        self._err_wrap(ft.tcioflush(self._ctx))
+        self.flush()
         self.write(self.__cmd(0xCAFE, total_bytes - 1))
 
-        # Transmit data
+        # Transmit data, checksum is updated with every chunk written
         result = 0
+        crc = 0
+        offset = 0
         start_time = time()
-        self.write(data)
+        while offset < total_bytes:
+            chunk_len = self.write(data[offset:offset + 1 * MiB])
+            crc = zlib.crc32(view[offset:offset + chunk_len], crc)
+            offset += chunk_len
         while not result:
             result_len, result = self.read(1)
             if result_len == 0:
@@ -105,9 +145,10 @@ class FPGA:
         print("Wrote %.02f MiB (%d bytes) to FPGA in %f seconds (%.02f MiB/s)" %
               (data_len_mb, total_bytes, exec_time, data_len_mb / exec_time))
 
-        # Verify data
+        # Verify data (FPGA checks the content itself only for the incrementing pattern)
         result = 0 if not result else result[0]
-        print("Verify data: %s" % ('ok' if result == 0x42 else 'error'))
+        ok = (crc == self.__crc(0)) and (result == 0x42 or not pattern)
+        print("Verify data: %s" % ('ok' if ok else 'error'))
 
 
 if __name__ == '__main__':
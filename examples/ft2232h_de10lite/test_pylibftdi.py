@@ -1,30 +1,62 @@
 #!/usr/bin/env python3
 
 from pylibftdi import Driver, Device
+from ctypes import byref, c_ushort
 from time import time, sleep
+import trace245
+import zlib
 
 KiB = 1024
 MiB = KiB * 1024
 
 
 class FPGA(Device):
-    def __init__(self, ftdi_serial, fifo245_mode):
+    """Session might be recorded to the trace file (record) or served from it without a board (replay),
+    with the original timing (realtime) or as fast as possible - see trace245.py"""
+
+    def __init__(self, ftdi_serial, fifo245_mode, record=None, replay=None, realtime=False):
         super().__init__(device_id=ftdi_serial, mode='b',
                          lazy_open=True, interface_select=1)
         self.fifo245_mode = fifo245_mode
+        self.record = record
+        self.replay = replay
+        self.realtime = realtime
 
     def __enter__(self):
+        if self.replay:
+            self.trace = trace245.attach(self, replay=self.replay, realtime=self.realtime)
+            return self
         super().open()
         self.ftdi_fn.ftdi_set_bitmode(0, 0x40 if self.fifo245_mode == 'sync' else 0x00)
         self.flush()
+        self.trace = trace245.attach(self, record=self.record)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        super().close()
+        if self.trace:
+            self.trace.close()
+        if not self.replay:
+            super().close()
+
+    def getModemStatus(self):
+        status = c_ushort()
+        self.ftdi_fn.ftdi_poll_modem_status(byref(status))
+        return status.value
 
     def __cmd(self, code, data):
         return ((0xAA << 56) | (code << 40) | (data << 8) | 0x55).to_bytes(8, 'little')
 
+    def __crc(self, stream):
+        """CRC-32 of the last RX (0) or TX (1) test stream calculated by FPGA"""
+        self.write(self.__cmd(0xC3C2, stream))
+        crc = b''
+        while len(crc) < 4:
+            chunk = self.read(4 - len(crc))
+            if not chunk:
+                return None
+            crc += chunk
+        return int.from_bytes(crc, 'little')
+
     def test_led(self):
         self.write(self.__cmd(0x1ED0, 1))
         sleep(2)
@@ -32,40 +64,52 @@ class FPGA(Device):
         sleep(2)
 
     def test_read(self, total_bytes=1 * MiB):
-        # Prepare data
-        golden_data = [i % 256 for i in range(total_bytes)]
-
         # Start read test
         self.write(self.__cmd(0xBEEF, total_bytes - 1))
 
-        # Receive data
+        # Receive data, checksum is updated with every chunk instead of storing the data
         self.flush()
+        crc = 0
+        data_len = 0
         start_time = time()
-        data = self.read(total_bytes)
+        while data_len < total_bytes:
+            chunk = self.read(min(1 * MiB, total_bytes - data_len))
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            data_len += len(chunk)
         exec_time = time() - start_time
 
         # Print statistics
-        data = [b for b in data]
-        data_len = len(data)
         data_len_mb = data_len / MiB
         print("Read %.02f MiB (%d bytes) from FPGA in %f seconds (%.02f MiB/s)" %
               (data_len_mb, data_len, exec_time, data_len_mb / exec_time))
 
         # Verify data
-        print("Verify data: %s" % ('ok' if golden_data == data else 'error'))
+        ok = (data_len == total_bytes) and (crc == self.__crc(1))
+        print("Verify data: %s" % ('ok' if ok else 'error'))
 
-    def test_write(self, total_bytes=1 * MiB):
-        # Prepare data
-        data = bytes(bytearray([i % 256 for i in range(total_bytes)]))
+    def test_write(self, total_bytes=1 * MiB, data=None):
+        # Prepare data - any payload might be provided, it is verified with CRC
+        pattern = data is None
+        if pattern:
+            data = bytes(bytearray([i % 256 for i in range(total_bytes)]))
+        total_bytes = len(data)
+        view = memoryview(data)
 
         # Start write test
         self.write(self.__cmd(0xCAFE, total_bytes - 1))
 
-        # Transmit data
+        # Transmit data, checksum is updated with every chunk written
         self.flush()
         result = 0
+        crc = 0
+        offset = 0
         start_time = time()
-        self.write(data)
+        while offset < total_bytes:
+            chunk_len = self.write(data[offset:offset + 1 * MiB])
+            crc = zlib.crc32(view[offset:offset + chunk_len], crc)
+            offset += chunk_len
         while not result:
             result = self.read(1)
         exec_time = time() - start_time
@@ -75,9 +119,10 @@ class FPGA(Device):
         print("Wrote %.02f MiB (%d bytes) to FPGA in %f seconds (%.02f MiB/s)" %
               (data_len_mb, total_bytes, exec_time, data_len_mb / exec_time))
 
-        # Verify data
+        # Verify data (FPGA checks the content itself only for the incrementing pattern)
         result = 0 if not result else result[0]
-        print("Verify data: %s" % ('ok' if result == 0x42 else 'error'))
+        ok = (crc == self.__crc(0)) and (result == 0x42 or not pattern)
+        print("Verify data: %s" % ('ok' if ok else 'error'))
 
 
 if __name__ == "__main__":
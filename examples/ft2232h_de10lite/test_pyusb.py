@@ -2,6 +2,8 @@
 
 import usb.core
 import usb.util
+import trace245
+import zlib
 from time import time, sleep
 
 KiB = 1024
@@ -9,13 +11,23 @@ MiB = KiB * 1024
 
 
 class FPGA:
-    def __init__(self, serial, sync=True, vid=0x0403, pid=0x6010):
+    """Session might be recorded to the trace file (record) or served from it without a board (replay),
+    with the original timing (realtime) or as fast as possible - see trace245.py.
+    Modem status is recorded as a part of read data - the first two bytes of every packet."""
+
+    def __init__(self, serial, sync=True, vid=0x0403, pid=0x6010, record=None, replay=None, realtime=False):
         self._vid = vid
         self._pid = pid
         self._serial = serial
         self._sync = sync
+        self._record = record
+        self._replay = replay
+        self._realtime = realtime
 
     def __enter__(self):
+        if self._replay:
+            self._trace = trace245.attach(self, replay=self._replay, realtime=self._realtime)
+            return self
         dev = usb.core.find(idVendor=self._vid, idProduct=self._pid)
         if dev is None or dev.serial_number != self._serial:
             raise Exception("Device was not found!")
@@ -24,13 +36,17 @@ class FPGA:
             self._ft.detach_kernel_driver(0)
         usb.util.claim_interface(self._ft, 0)
         self._ft.ctrl_transfer(bmRequestType=0x40, bRequest=11, wValue=0x000140ff if self._sync else 0x000000ff)
+        self._trace = trace245.attach(self, record=self._record)
         return self
 
     def __exit__(self, type, value, traceback):
-        usb.util.release_interface(self._ft, 0)
+        if self._trace:
+            self._trace.close()
+        if not self._replay:
+            usb.util.release_interface(self._ft, 0)
 
     def write(self, data):
-        self._ft.write(0x2, data)  # OUT EP
+        return self._ft.write(0x2, data)  # OUT EP
 
     def read(self, n):
         return self._ft.read(0x81, n, 100)  # IN EP
@@ -38,6 +54,17 @@ class FPGA:
     def __cmd(self, code, data):
         return ((0xAA << 56) | (code << 40) | (data << 8) | 0x55).to_bytes(8, 'little')
 
+    def __crc(self, stream):
+        """CRC-32 of the last RX (0) or TX (1) test stream calculated by FPGA"""
+        self.write(self.__cmd(0xC3C2, stream))
+        crc = b''
+        while len(crc) < 4:
+            data = self.read(6 - len(crc))
+            if len(data) == 0:
+                return None
+            crc += bytes(data[2:])  # skip modem status bytes
+        return int.from_bytes(crc, 'little')
+
     def test_led(self):
         self.write(self.__cmd(0x1ED0, 1))
         sleep(2)
@@ -45,49 +72,56 @@ class FPGA:
         sleep(2)
 
     def test_read(self, total_bytes=1 * MiB):
-        # Prepare data
-        golden_data = [i % 256 for i in range(total_bytes)]
-
         # Start read test
         self.write(self.__cmd(0xBEEF, total_bytes - 1))
 
-        # Receive data
-        chunks = []
+        # Receive data, checksum is updated with every chunk instead of storing the data
+        crc = 0
+        data_len = 0
         start_time = time()
-        while total_bytes > 0:
+        while data_len < total_bytes:
             chunk = self.read(256 * KiB)
             chunk_len = len(chunk)
             if chunk_len == 0:
                 break
             elif chunk_len > 2:  # skip if read modem status bytes only
-                chunks.append(chunk)
-                modem_bytes = ((chunk_len // 512) + (1 if chunk_len % 512 else 0)) * 2
-                total_bytes -= (chunk_len - modem_bytes)
+                view = memoryview(chunk)
+                # skip the two modem status bytes transfered at the start of every packet
+                for offset in range(0, chunk_len, 512):
+                    packet = view[offset + 2:offset + 512]
+                    crc = zlib.crc32(packet, crc)
+                    data_len += len(packet)
         exec_time = time() - start_time
 
         # Print statistics
-        data = [b for chunk in chunks for b in chunk]  # flatten all chunks
-        # strips the two modem status bytes transfered during every read
-        data = [b for i, b in enumerate(data) if i % 512 not in [0, 1]]
-        data_len = len(data)
         data_len_mb = data_len / MiB
         print("Read %.02f MiB (%d bytes) from FPGA in %f seconds (%.02f MiB/s)" %
               (data_len_mb, data_len, exec_time, data_len_mb / exec_time))
 
         # Verify data
-        print("Verify data: %s" % ('ok' if golden_data == data else 'error'))
+        ok = (data_len == total_bytes) and (crc == self.__crc(1))
+        print("Verify data: %s" % ('ok' if ok else 'error'))
 
-    def test_write(self, total_bytes=1 * MiB):
-        # Prepare data
-        data = bytes(bytearray([i % 256 for i in range(total_bytes)]))
+    def test_write(self, total_bytes=1 * MiB, data=None):
+        # Prepare data - any payload might be provided, it is verified with CRC
+        pattern = data is None
+        if pattern:
+            data = bytes(bytearray([i % 256 for i in range(total_bytes)]))
+        total_bytes = len(data)
+        view = memoryview(data)
 
         # Start write test
         self.write(self.__cmd(0xCAFE, total_bytes - 1))
 
-        # Transmit data
+        # Transmit data, checksum is updated with every chunk written
         result = 0
+        crc = 0
+        offset = 0
         start_time = time()
-        self.write(data)
+        while offset < total_bytes:
+            chunk_len = self.write(view[offset:offset + 1 * MiB])
+            crc = zlib.crc32(view[offset:offset + chunk_len], crc)
+            offset += chunk_len
         while not result:
             data = self.read(3)
             if len(data) > 2:
@@ -99,8 +133,9 @@ class FPGA:
         print("Wrote %.02f MiB (%d bytes) to FPGA in %f seconds (%.02f MiB/s)" %
               (data_len_mb, total_bytes, exec_time, data_len_mb / exec_time))
 
-        # Verify data
-        print("Verify data: %s" % ('ok' if result == 0x42 else 'error'))
+        # Verify data (FPGA checks the content itself only for the incrementing pattern)
+        ok = (crc == self.__crc(0)) and (result == 0x42 or not pattern)
+        print("Verify data: %s" % ('ok' if ok else 'error'))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+"""Record and replay of FT device sessions.
+
+Recorder wraps a device object (e.g. ftd2xx device) and stores every read/write
+call - its start time, duration, size and payload - and modem status into a
+binary trace file. Replay serves the trace back through the same interface,
+either with the original timing or as fast as possible, so host processing can
+be benchmarked and debugged without a board. attach() does the same for the
+read/write methods of the example FPGA classes.
+
+Trace file is a header followed by records (all fields are little-endian):
+
+    header: | magic 'FT245TRC' (8) | version (2) | flags (2) |
+    record: | kind (1) | time, ns (8) | duration, ns (4) | arg (4) | length (4) | payload (length bytes) |
+
+where time is counted from the start of recording, and arg is the requested
+size for reads, the number of bytes written for writes or the status for modem
+status records. Payload is stored for reads and writes only. If MODEM_POLL flag
+is set, every read without data is followed by the modem status record made by
+Recorder itself.
+"""
+
+import mmap
+import struct
+import sys
+from collections import namedtuple
+from types import SimpleNamespace
+from time import perf_counter_ns, sleep
+
+MAGIC = b'FT245TRC'
+VERSION = 1
+HEADER = struct.Struct('<8sHH')
+RECORD = struct.Struct('<BQIII')
+
+READ = 1
+WRITE = 2
+MODEM = 3
+KIND_NAMES = {READ: 'read', WRITE: 'write', MODEM: 'modem'}
+
+MODEM_POLL = 0x1
+
+# Device configuration calls, which do nothing on replay
+CONFIG_CALLS = ['resetDevice', 'setBitMode', 'setTimeouts', 'setUSBParameters', 'setFlowControl', 'purge', 'flush']
+
+Record = namedtuple('Record', ['kind', 'time', 'duration', 'arg', 'payload'])
+
+
+class TraceWriter:
+    """Append records to the trace file"""
+
+    def __init__(self, path, flags=0):
+        self._file = open(path, 'wb', buffering=1024 * 1024)
+        self._file.write(HEADER.pack(MAGIC, VERSION, flags))
+        self._start = perf_counter_ns()
+
+    def now(self):
+        """Time in ns from the start of recording"""
+        return perf_counter_ns() - self._start
+
+    def write(self, kind, time, duration, arg, payload=b''):
+        self._file.write(RECORD.pack(kind, time, min(duration, 0xFFFFFFFF), arg, len(payload)))
+        self._file.write(payload)
+
+    def close(self):
+        self._file.close()
+
+
+class TraceReader:
+    """Memory-mapped trace file, payloads are returned as memoryview slices without copying"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version, self.flags = HEADER.unpack_from(self._view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("'%s' is not a trace file of version %d" % (path, VERSION))
+
+    def __iter__(self):
+        offset = HEADER.size
+        end = len(self._view)
+        while offset < end:
+            kind, time, duration, arg, length = RECORD.unpack_from(self._view, offset)
+            offset += RECORD.size
+            yield Record(kind, time, duration, arg, self._view[offset:offset + length])
+            offset += length
+
+    def close(self):
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            pass  # payloads are still referenced by the caller, mapping is closed by GC
+
+
+class Recorder:
+    """Device wrapper, which records read/write calls and modem status to the trace.
+
+    If modem_poll is set and the device has getModemStatus(), modem status is
+    requested and recorded after every read, which returned no data, to capture
+    the state of stalls. With tuple_read, device read() returns (length, data).
+    """
+
+    def __init__(self, dev, path, modem_poll=False, tuple_read=False):
+        self._dev = dev
+        self.modem_poll = modem_poll and hasattr(dev, 'getModemStatus')
+        self.tuple_read = tuple_read
+        self._trace = TraceWriter(path, MODEM_POLL if self.modem_poll else 0)
+
+    def __getattr__(self, name):
+        # device configuration and other calls go directly to the device
+        return getattr(self._dev, name)
+
+    def read(self, n):
+        start = self._trace.now()
+        result = self._dev.read(n)
+        data = result[1][:result[0]] if self.tuple_read else result
+        self._trace.write(READ, start, self._trace.now() - start, n, data)
+        if self.modem_poll and not len(data):
+            self.getModemStatus()
+        return result
+
+    def write(self, data):
+        start = self._trace.now()
+        written = self._dev.write(data)
+        self._trace.write(WRITE, start, self._trace.now() - start, written, data)
+        return written
+
+    def getModemStatus(self):
+        start = self._trace.now()
+        status = self._dev.getModemStatus()
+        self._trace.write(MODEM, start, self._trace.now() - start, status)
+        return status
+
+    def close(self):
+        self._trace.close()
+        self._dev.close()
+
+
+class Replay:
+    """Device, which serves the recorded trace.
+
+    Calls have to come in the recorded order. With realtime set, every call
+    returns at the same moment (relative to the first call) as it was recorded,
+    otherwise as fast as possible. Reads return memoryview slices of the trace
+    ((length, data) tuples with tuple_read). Configuration calls (CONFIG_CALLS)
+    do nothing. Modem status, polled by Recorder itself, is in modem_status.
+    """
+
+    def __init__(self, path, realtime=False, tuple_read=False):
+        self._trace = TraceReader(path)
+        self._records = iter(self._trace)
+        self.realtime = realtime
+        self.tuple_read = tuple_read
+        self.modem_status = None
+        self._start = None
+
+    def __getattr__(self, name):
+        if name in CONFIG_CALLS:
+            return lambda *args, **kwargs: None
+        raise AttributeError("'%s' call can't be replayed" % name)
+
+    def _next(self, kind):
+        record = next(self._records, None)
+        if record is None:
+            raise RuntimeError("Trace is over: no more %s calls recorded" % KIND_NAMES[kind])
+        if record.kind != kind:
+            raise RuntimeError("Trace mismatch: %s is called, but %s is recorded" %
+                               (KIND_NAMES[kind], KIND_NAMES[record.kind]))
+        if self.realtime:
+            if self._start is None:
+                self._start = perf_counter_ns() - record.time
+            delay = self._start + record.time + record.duration - perf_counter_ns()
+            if delay > 0:
+                sleep(delay / 1e9)
+        return record
+
+    def read(self, n):
+        data = self._next(READ).payload
+        if (self._trace.flags & MODEM_POLL) and not data:
+            self.modem_status = self._next(MODEM).arg
+        return (len(data), data) if self.tuple_read else data
+
+    def write(self, data):
+        return self._next(WRITE).arg
+
+    def getModemStatus(self):
+        self.modem_status = self._next(MODEM).arg
+        return self.modem_status
+
+    def close(self):
+        self._trace.close()
+
+
+def attach(fpga, record=None, replay=None, realtime=False, tuple_read=False):
+    """Route read/write (and flush, getModemStatus if any) methods of the FPGA object through the trace.
+
+    Returns Recorder or Replay object (to be closed at the end of the session) or None if neither record nor replay
+    path is provided. On replay the device should not be opened.
+    """
+    calls = [name for name in ['read', 'write', 'flush', 'getModemStatus'] if hasattr(fpga, name)]
+    if replay:
+        io = Replay(replay, realtime, tuple_read)
+    elif record:
+        methods = {name: getattr(fpga, name) for name in calls}
+        io = Recorder(SimpleNamespace(close=lambda: None, **methods), record, modem_poll=True, tuple_read=tuple_read)
+    else:
+        return None
+    for name in calls:
+        setattr(fpga, name, getattr(io, name))
+    return io
+
+
+def info(path):
+    """Print trace summary"""
+    trace = TraceReader(path)
+    stats = {kind: [0, 0, 0] for kind in KIND_NAMES.keys()}  # calls, bytes, ns inside calls
+    last_time = 0
+    for record in trace:
+        stats[record.kind][0] += 1
+        stats[record.kind][1] += len(record.payload)
+        stats[record.kind][2] += record.duration
+        last_time = record.time + record.duration
+    print("Trace %s: %f seconds" % (path, last_time / 1e9))
+    for kind, (calls, total_bytes, duration) in stats.items():
+        speed = '%.02f MiB/s' % (total_bytes / 1024 / 1024 / (duration / 1e9)) if duration and total_bytes else '-'
+        print("  %-5s %8d calls %12d bytes %10f seconds inside calls (%s)" %
+              (KIND_NAMES[kind], calls, total_bytes, duration / 1e9, speed))
+    trace.close()
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        info(path)
@@ -191,9 +191,9 @@ end endgenerate
 //-------------------------------------------------------------------
 // Protocol FSM
 //-------------------------------------------------------------------
-localparam RD_CNT_W   = $clog2(READ_TICKS);
+localparam RD_CNT_W   = (READ_TICKS > 1) ? $clog2(READ_TICKS) : 1;
 localparam RD_CNT_MAX = RD_CNT_W'(READ_TICKS - 1);
-localparam WR_CNT_W   = $clog2(WRITE_TICKS);
+localparam WR_CNT_W   = (WRITE_TICKS > 1) ? $clog2(WRITE_TICKS) : 1;
 localparam WR_CNT_MAX = WR_CNT_W'(WRITE_TICKS - 1);
 
 enum logic [2:0] {
@@ -23,6 +23,23 @@ data_t rxbuf [$];
 localparam DEFAULT_TXBUF_LIMIT = 0;
 int txbuf_limit = DEFAULT_TXBUF_LIMIT;
 
+// FT2232H asynchronous FIFO timings (datasheet, FT245 asynchronous FIFO interface)
+localparam realtime T_RD_TO_RXF    = 14ns; // t1: RD# inactive to RXF# (max)
+localparam realtime T_RXF_INACTIVE = 49ns; // t2: RXF# inactive after RD# cycle (min)
+localparam realtime T_RD_TO_DATA   = 14ns; // t3: RD# to DATA (max)
+localparam realtime T_RD_ACTIVE    = 30ns; // t4: RD# active pulse width (min)
+localparam realtime T_TXE_INACTIVE = 49ns; // t6: TXE# inactive after WR# cycle (min)
+localparam realtime T_WR_ACTIVE    = 30ns; // t7: WR# active pulse width (min)
+localparam realtime T_WR_TO_TXE    = 14ns; // t8: WR# to TXE# (max)
+localparam realtime T_DATA_SETUP   = 5ns;  // t9: DATA to WR# active setup time (min)
+localparam realtime T_DATA_HOLD    = 5ns;  // t10: DATA hold time after WR# inactive (min)
+
+int timing_err;
+
+// Minimal period between RD#/WR# strobes seen (0 - less than two strobes), i.e. the best throughput achieved
+realtime rd_period;
+realtime wr_period;
+
 task automatic send(ref data_t data []); // when host send data, it go to the receive buffer
     foreach (data[i])
         rxbuf.push_front(data[i]);
@@ -55,11 +72,12 @@ task serve_read;
     forever begin: data_drv
         wait(rxbuf.size() != 0);
         do begin
-            #49ns rxfn = 1'b0;
+            #T_RXF_INACTIVE rxfn = 1'b0;
             @(negedge rdn);
-            #14ns din = rxbuf.pop_back();
+            din = 'x; // data is not valid until t3
+            #T_RD_TO_DATA din = rxbuf.pop_back();
             @(posedge rdn);
-            #14ns rxfn = 1'b1;
+            #T_RD_TO_RXF rxfn = 1'b1;
         end while (rxbuf.size() != 0);
     end
 endtask
@@ -68,11 +86,66 @@ task serve_write;
     txen = 1'b0;
     forever begin: data_drv
         wait(txbuf.size() < txbuf_limit);
-        #49ns txen = 1'b0;
+        #T_TXE_INACTIVE txen = 1'b0;
         @(negedge wrn);
         txbuf.push_front(dout);
-        #14ns txen = 1'b1;
+        #T_WR_TO_TXE txen = 1'b1;
     end
 endtask
 
+//-------------------------------------------------------------------
+// Timing checks
+//-------------------------------------------------------------------
+function automatic void timing_error(string msg);
+    $error("FT245 timing violation: %s", msg);
+    timing_err += 1;
+endfunction
+
+realtime rd_fall_time;
+realtime wr_fall_time;
+realtime wr_rise_time = -T_DATA_HOLD;
+realtime dout_change_time;
+
+always @(negedge rdn) begin
+    if ((rd_fall_time > 0) && ((rd_period == 0) || (($realtime - rd_fall_time) < rd_period)))
+        rd_period = $realtime - rd_fall_time;
+    rd_fall_time = $realtime;
+    if (rxfn !== 1'b0)
+        timing_error("RD# is active, but RXF# is inactive");
+end
+
+// checks below start after the first real strobe, X->1 of RD#/WR# and X->0 of DATA at reset are not strobes
+always @(posedge rdn) begin
+    if ((rd_fall_time > 0) && (($realtime - rd_fall_time) < T_RD_ACTIVE))
+        timing_error($sformatf("RD# active pulse width is %0t, but should be at least %0t",
+                               $realtime - rd_fall_time, T_RD_ACTIVE));
+end
+
+always @(negedge wrn) begin
+    if ((wr_fall_time > 0) && ((wr_period == 0) || (($realtime - wr_fall_time) < wr_period)))
+        wr_period = $realtime - wr_fall_time;
+    wr_fall_time = $realtime;
+    if (txen !== 1'b0)
+        timing_error("WR# is active, but TXE# is inactive");
+    if (($realtime - dout_change_time) < T_DATA_SETUP)
+        timing_error($sformatf("DATA to WR# setup time is %0t, but should be at least %0t",
+                               $realtime - dout_change_time, T_DATA_SETUP));
+end
+
+always @(posedge wrn) begin
+    wr_rise_time = $realtime;
+    if ((wr_fall_time > 0) && (($realtime - wr_fall_time) < T_WR_ACTIVE))
+        timing_error($sformatf("WR# active pulse width is %0t, but should be at least %0t",
+                               $realtime - wr_fall_time, T_WR_ACTIVE));
+end
+
+always @(dout) begin
+    dout_change_time = $realtime;
+    if (wrn === 1'b0)
+        timing_error("DATA is changed while WR# is active");
+    else if ((wr_fall_time > 0) && (($realtime - wr_rise_time) < T_DATA_HOLD))
+        timing_error($sformatf("DATA hold time after WR# is %0t, but should be at least %0t",
+                               $realtime - wr_rise_time, T_DATA_HOLD));
+end
+
 endinterface
\ No newline at end of file
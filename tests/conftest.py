@@ -1,8 +1,17 @@
+import itertools
+import pytest
+from sim import SimSession
+
+
 # Based on htpps://github.com/pytest-dev/pytest/issues/3730#issuecomment-567142496
 def pytest_configure(config):
     config.addinivalue_line(
         "markers", "uncollect_if(*, func): function to unselect tests from parametrization"
     )
+    config.addinivalue_line(
+        "markers", "covering(*, factors={}): parametrization may be reduced to a covering set in the pairwise tier; "
+                   "factors are functions of the parameters which values have to be covered too"
+    )
 
 def pytest_collection_modifyitems(config, items):
     removed=[]
@@ -15,10 +24,82 @@ def pytest_collection_modifyitems(config, items):
                 removed.append(item)
                 continue
         kept.append(item)
+    if config.getoption("tier") == "pairwise":
+        kept, reduced = reduce_to_covering_set(config, kept)
+        removed += reduced
     if removed:
         config.hook.pytest_deselected(items=removed)
         items[:] = kept
 
+def pytest_report_collectionfinish(config):
+    return getattr(config, "_covering_report", [])
+
 def pytest_addoption(parser):
     parser.addoption("--sim", action="store", default="modelsim")
     parser.addoption("--gui", action="store_true", default=False)
+    parser.addoption("--session", action="store_true", default=False,
+                     help="keep one simulator process per worker instead of relaunching it for every test")
+    parser.addoption("--session-timeout", action="store", type=int, default=3600,
+                     help="seconds to wait for a test in the persistent session before it is restarted")
+    parser.addoption("--tier", action="store", default="exhaustive", choices=["exhaustive", "pairwise"],
+                     help="exhaustive - full parametrization matrix, "
+                          "pairwise - covering set of the tests marked with 'covering'")
+
+@pytest.fixture(scope="session")
+def sim_session(pytestconfig):
+    """Persistent simulator session shared by all tests of the (xdist worker) process"""
+    if not pytestconfig.getoption("session") or pytestconfig.getoption("gui"):
+        yield None
+        return
+    session = SimSession(name=pytestconfig.getoption("sim"), timeout=pytestconfig.getoption("session_timeout"))
+    yield session
+    session.close()
+
+
+#------------------------------------------------------------------------------
+# Combinatorial reduction of the parametrization matrix
+#------------------------------------------------------------------------------
+def factor_tuples(item, strength):
+    """Return all the combinations of parameter (and derived factor) values of the item"""
+    values = dict(item.callspec.params)
+    factors = item.get_closest_marker('covering').kwargs.get('factors', {})
+    for name, func in factors.items():
+        values[name] = func(**item.callspec.params)
+    return set(itertools.combinations(sorted(values.items()), strength))
+
+def covering_set(items, strength=2):
+    """Greedy selection of the items which cover all the value tuples covered by all items together"""
+    tuples = [factor_tuples(item, strength) for item in items]
+    uncovered = set().union(*tuples)
+    selected = []
+    while uncovered:
+        best = max(range(len(items)), key=lambda i: len(tuples[i] & uncovered))
+        selected.append(best)
+        uncovered -= tuples[best]
+    return [items[i] for i in sorted(selected)]
+
+def coverage(selected, items, strength):
+    """Part of the value tuples of all items which is covered by selected items"""
+    total = set().union(*[factor_tuples(item, strength) for item in items])
+    covered = set().union(*[factor_tuples(item, strength) for item in selected])
+    return len(covered & total) / len(total) if total else 1.0
+
+def reduce_to_covering_set(config, items):
+    """Replace items of every test function marked with 'covering' by their pairwise covering set"""
+    groups = {}
+    for item in items:
+        if item.get_closest_marker('covering') and hasattr(item, 'callspec'):
+            groups.setdefault(item.nodeid.split('[')[0], []).append(item)
+    report = []
+    selected = set()
+    for name, group in groups.items():
+        covering = covering_set(group)
+        selected.update(covering)
+        report.append("pairwise tier: %s - %d of %d tests, %.1f%% of 2-wise and %.1f%% of 3-wise value tuples" %
+                      (name, len(covering), len(group), 100 * coverage(covering, group, 2),
+                       100 * coverage(covering, group, 3)))
+    config._covering_report = report
+    grouped = set(itertools.chain(*groups.values()))
+    kept = [item for item in items if item not in grouped or item in selected]
+    removed = [item for item in items if item in grouped and item not in selected]
+    return kept, removed
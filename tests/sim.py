@@ -8,6 +8,11 @@ All simulator executables must be visible in PATH.
 
 import subprocess
 import argparse
+import queue
+import shutil
+import tempfile
+import threading
+import time
 from pathlib import Path
 
 
@@ -66,12 +71,126 @@ def write_memfile(path, data):
         memfile.writelines(['%x\n' % d for d in data])
 
 
+class SimSession:
+    """Persistent simulator process driven over its Tcl interface.
+
+    Simulator tool is started once and then executes scripts for many tests,
+    so tool startup and license checkout are paid only once per session
+    (e.g. once per pytest-xdist worker). Transcript of every script is
+    written to a separate file inside script working directory.
+    Process, which does not finish a script in timeout seconds, is killed
+    and started again for the next script.
+    """
+
+    def __init__(self, name='modelsim', done_marker='!@# SESSION DONE #@!', timeout=3600):
+        self.name = name
+        self.done_marker = done_marker
+        self.timeout = timeout
+        self._launchers = {'modelsim': ['vsim', '-c']}
+        if self.name not in self._launchers.keys():
+            raise ValueError("Persistent session is not supported for '%s'" % self.name)
+        self._child = None
+        self._lines = None
+        self._scratch_dir = None
+
+    def start(self):
+        """Start simulator process"""
+        print('Start %s session' % self.name)
+        # process starts in its own directory, so default transcript and modelsim.ini of the tool
+        # are not shared between sessions (e.g. xdist workers)
+        self._scratch_dir = tempfile.mkdtemp(prefix='sim_session_')
+        self._child = subprocess.Popen(self._launchers[self.name], cwd=self._scratch_dir, stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       universal_newlines=True)
+        # stdout is read in a separate thread, so waiting for a line can be limited in time
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self._child.stdout, self._lines), daemon=True).start()
+        self._send('fconfigure stdout -buffering line')
+
+    def close(self):
+        """Stop simulator process"""
+        if self.is_alive:
+            self._send('quit -force')
+            self._child.wait()
+        self._child = None
+        self._remove_scratch_dir()
+
+    def kill(self):
+        """Kill simulator process"""
+        if self.is_alive:
+            self._child.kill()
+            self._child.wait()
+        self._child = None
+        self._remove_scratch_dir()
+
+    def _remove_scratch_dir(self):
+        if self._scratch_dir:
+            shutil.rmtree(self._scratch_dir, ignore_errors=True)
+        self._scratch_dir = None
+
+    @staticmethod
+    def _read_stdout(stdout, lines):
+        for line in stdout:
+            lines.put(line)
+        lines.put(None)
+
+    @property
+    def is_alive(self):
+        return self._child is not None and self._child.poll() is None
+
+    def _send(self, cmd):
+        self._child.stdin.write(cmd + '\n')
+        self._child.stdin.flush()
+
+    def execute(self, cwd, script, transcript='transcript'):
+        """Source Tcl script inside the working directory.
+
+        Args:
+            cwd : working directory path
+            script : script name (relative to cwd)
+            transcript : transcript file name (relative to cwd)
+
+        Returns:
+            tuple with transcript contents and return code
+        """
+        if not self.is_alive:
+            self.start()
+        transcript = path_join(cwd, transcript)
+        self._send('cd {%s}' % Path(cwd).as_posix())
+        self._send('transcript file {%s}' % transcript.as_posix())
+        self._send('set rc [catch {source %s} err]' % script)
+        self._send('if {$rc} {echo $err}')
+        self._send('quit -sim')
+        self._send('transcript file {}')
+        self._send('puts "%s $rc"' % self.done_marker)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.kill()
+                raise RuntimeError("Session of '%s' was killed after %d seconds of waiting!" %
+                                   (self.name, self.timeout))
+            if line is None:
+                self.kill()
+                raise RuntimeError("Session of '%s' was terminated unexpectedly!" % self.name)
+            # marker is not always at the line start, e.g. it might follow the prompt
+            if self.done_marker in line:
+                retcode = int(line.split(self.done_marker)[-1].split()[0])
+                break
+        stdout = transcript.read_text(encoding="utf-8") if transcript.exists() else ''
+        return (stdout, retcode)
+
+
 class Simulator:
     """Simulator wrapper"""
 
-    def __init__(self, name='modelsim', gui=True, cwd='work', passed_marker='!@# TEST PASSED #@!'):
+    def __init__(self, name='modelsim', gui=True, cwd='work', passed_marker='!@# TEST PASSED #@!', session=None):
         self.gui = gui
         self.passed_marker = passed_marker
+        self.session = session
+        if self.session and self.session.name != name:
+            raise ValueError("Session of '%s' can't be used with '%s'" % (self.session.name, name))
 
         self.cwd = Path(cwd).resolve()
         if parent_dir(__file__) == self.cwd:
@@ -137,6 +256,19 @@ class Simulator:
             raise RuntimeError(
                 "Execution failed at '%s' with return code %d!" % (exec_str, self.retcode))
 
+    def _exec_session(self, script):
+        """Execute script in the persistent session.
+
+        Args:
+            script : string with script name
+        """
+        print("source %s (session)" % script)
+        self.stdout, self.retcode = self.session.execute(self.cwd, script)
+        print(self.stdout)
+        if self.retcode:
+            raise RuntimeError(
+                "Execution failed at '%s' with return code %d!" % (script, self.retcode))
+
     def _run_modelsim(self):
         """Run Modelsim"""
         print('Run Modelsim (cwd=%s)' % self.cwd)
@@ -156,6 +288,11 @@ class Simulator:
             run = 'run -all'
         else:
             run = ''
+        if self.session:
+            # simulation has to stop on $finish to keep session alive
+            vsim_opts = '-onfinish stop '
+        else:
+            vsim_opts = ''
         compile_tcl = """
 proc rr  {{}} {{
   write format wave -window .main_pane.wave.interior.cs.body.pw.wf wave.do
@@ -165,7 +302,7 @@ proc q  {{}} {{quit -force}}
 vlib {worklib}
 vmap work {worklib}
 {sources}
-eval vsim {worklib}.{top}
+eval vsim {vsim_opts}{worklib}.{top}
 if [file exist wave.do] {{
   source wave.do
 }}
@@ -177,7 +314,11 @@ if [file exist wave.do] {{
                                        incdirs=incdirs,
                                        sources=sources,
                                        defines=defines,
+                                       vsim_opts=vsim_opts,
                                        run=run))
+        if self.session:
+            self._exec_session('compile.tcl')
+            return
         vsim_args = '-do compile.tcl'
         if not self.gui:
             vsim_args += ' -c'
@@ -130,6 +130,8 @@ initial begin : main
     #1us;
     `TESTCASE(test_err);
     #1us;
+    test_err += ft245_if.timing_err;
+    $display("!@# STROBE PERIOD: RD# %0.3f ns, WR# %0.3f ns #@!", ft245_if.rd_period, ft245_if.wr_period);
     if (test_err)
         $error("!@# TEST FAILED - %0d ERRORS #@!", test_err);
     else
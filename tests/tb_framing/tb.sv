@@ -0,0 +1,197 @@
+module tb;
+
+// To control from launch scripts
+`ifndef RX_STREAM_LEN `define RX_STREAM_LEN 0    `endif
+`ifndef TX_DATA_LEN   `define TX_DATA_LEN   3000 `endif
+`ifndef TX_CTRL_AFTER `define TX_CTRL_AFTER 100  `endif
+
+//-------------------------------------------------------------------
+// Testbench parameters
+//-------------------------------------------------------------------
+localparam CHAN_N        = 2;
+localparam MAX_PAYLOAD   = 1024;
+localparam CTRL_CHAN     = 0;
+localparam DATA_CHAN     = 1;
+localparam RX_STREAM_LEN = `RX_STREAM_LEN; // Bytes of framed stream in rx_stream.mem
+localparam TX_DATA_LEN   = `TX_DATA_LEN;   // Bytes to send over the data channel
+localparam TX_CTRL_AFTER = `TX_CTRL_AFTER; // Data channel bytes sent before the control request
+localparam TX_CTRL_LEN   = 4;
+
+localparam CLK_FREQ = 100e6;
+
+//-------------------------------------------------------------------
+// Clock and reset generation
+//-------------------------------------------------------------------
+bit clk;
+initial forever #(1ns * (0.5 / CLK_FREQ) / 1e-9) clk = ~clk;
+
+bit rst = 1;
+initial begin
+    repeat(3) @(negedge clk);
+    rst = 0;
+end
+
+//-------------------------------------------------------------------
+// Demultiplexer: framed stream from rx_stream.mem, payload and frame ends to demux_out.txt
+//-------------------------------------------------------------------
+logic [7:0] rx_stream [RX_STREAM_LEN > 0 ? RX_STREAM_LEN : 1];
+logic [7:0] in_data = '0;
+logic       in_valid = 1'b0;
+logic [7:0] rx_chan;
+logic [7:0] rx_data;
+logic       rx_valid;
+logic       rx_last;
+logic       rx_crc_ok;
+
+frame_demux #(
+    .MAX_PAYLOAD (MAX_PAYLOAD)
+) frame_demux (
+    .clk        (clk),
+    .rst        (rst),
+    .in_data    (in_data),
+    .in_valid   (in_valid),
+    .out_chan   (rx_chan),
+    .out_data   (rx_data),
+    .out_valid  (rx_valid),
+    .out_last   (rx_last),
+    .out_crc_ok (rx_crc_ok)
+);
+
+//-------------------------------------------------------------------
+// Multiplexer: control request in the middle of a data frame, output with random backpressure to mux_out.txt
+//-------------------------------------------------------------------
+logic [CHAN_N-1:0]       tx_req;
+logic [CHAN_N-1:0][15:0] tx_len;
+logic [CHAN_N-1:0][7:0]  tx_data;
+logic [CHAN_N-1:0]       tx_rd;
+logic [7:0]              out_data;
+logic                    out_wr;
+logic                    out_full = 1'b0;
+
+int data_cnt = 0;
+int ctrl_cnt = 0;
+int data_sent = 0;
+int ctrl_sent = 0;
+
+assign tx_req[DATA_CHAN]  = (data_cnt != 0);
+assign tx_len[DATA_CHAN]  = (data_cnt > 'hFFFF) ? 16'hFFFF : 16'(data_cnt);
+assign tx_data[DATA_CHAN] = 8'(data_sent);
+assign tx_req[CTRL_CHAN]  = (ctrl_cnt != 0);
+assign tx_len[CTRL_CHAN]  = 16'(ctrl_cnt);
+assign tx_data[CTRL_CHAN] = 8'hC0 + 8'(ctrl_sent);
+
+frame_mux #(
+    .CHAN_N      (CHAN_N),
+    .MAX_PAYLOAD (MAX_PAYLOAD)
+) frame_mux (
+    .clk      (clk),
+    .rst      (rst),
+    .src_req  (tx_req),
+    .src_len  (tx_len),
+    .src_data (tx_data),
+    .src_rd   (tx_rd),
+    .out_data (out_data),
+    .out_wr   (out_wr),
+    .out_full (out_full)
+);
+
+always @(posedge clk) begin
+    if (tx_rd[DATA_CHAN]) begin
+        data_cnt  <= data_cnt - 1;
+        data_sent <= data_sent + 1;
+        if (data_sent == TX_CTRL_AFTER)
+            ctrl_cnt <= TX_CTRL_LEN;
+    end
+    if (tx_rd[CTRL_CHAN]) begin
+        ctrl_cnt  <= ctrl_cnt - 1;
+        ctrl_sent <= ctrl_sent + 1;
+    end
+    out_full <= ($urandom_range(0, 3) == 0);
+end
+
+//-------------------------------------------------------------------
+// Tests
+//-------------------------------------------------------------------
+`define START_TEST $display("--- Start %m ---")
+`define END_TEST   $display("--- End %m ---")
+
+task test_demux(output int err);
+    int f;
+    `START_TEST;
+    $readmemh("rx_stream.mem", rx_stream);
+    f = $fopen("demux_out.txt", "w");
+    fork
+        foreach (rx_stream[i]) begin
+            // random gaps between bytes
+            while ($urandom_range(0, 3) == 0)
+                @(posedge clk);
+            in_valid <= 1'b1;
+            in_data  <= rx_stream[i];
+            @(posedge clk);
+            in_valid <= 1'b0;
+        end
+        forever begin
+            @(posedge clk);
+            if (rx_valid)
+                $fdisplay(f, "data %0d %0d", rx_chan, rx_data);
+            if (rx_last)
+                $fdisplay(f, "last %0d %0d", rx_chan, rx_crc_ok);
+            if (rx_valid && rx_last) begin
+                $error("Payload data and frame end at the same cycle!");
+                err += 1;
+            end
+        end
+    join_any
+    repeat (4) @(posedge clk);
+    disable fork;
+    $fclose(f);
+    `END_TEST;
+endtask
+
+task test_mux(output int err);
+    int f;
+    `START_TEST;
+    f = $fopen("mux_out.txt", "w");
+    data_cnt = TX_DATA_LEN;
+    fork
+        forever begin
+            @(posedge clk);
+            if (out_wr && !out_full)
+                $fdisplay(f, "%0d", out_data);
+        end
+        begin
+            wait(data_cnt == 0 && ctrl_cnt == 0);
+            repeat (16) @(posedge clk);
+        end
+    join_any
+    disable fork;
+    $fclose(f);
+    if (out_wr) begin
+        $error("Framed stream is not finished!");
+        err += 1;
+    end
+    `END_TEST;
+endtask
+
+initial begin : main
+    int demux_err, mux_err, test_err;
+    wait(!rst);
+    #1us;
+    test_demux(demux_err);
+    test_mux(mux_err);
+    #1us;
+    test_err = demux_err + mux_err;
+    if (test_err)
+        $error("!@# TEST FAILED - %0d ERRORS #@!", test_err);
+    else
+        $display("!@# TEST PASSED #@!");
+    $finish();
+end
+
+initial begin : watchdog
+    #1ms;
+    $error("!@# TEST FAILED - TIMEOUT #@!");
+    $finish();
+end
+
+endmodule
@@ -0,0 +1,144 @@
+module tb;
+
+// To control from launch scripts
+`ifndef TX_LEN `define TX_LEN 3000 `endif
+`ifndef RX_LEN `define RX_LEN 3000 `endif
+
+//-------------------------------------------------------------------
+// Testbench parameters
+//-------------------------------------------------------------------
+localparam DATA_W = 8;
+localparam TX_LEN = `TX_LEN; // Bytes of the TX test (FPGA -> host)
+localparam RX_LEN = `RX_LEN; // Bytes of the RX tests (host -> FPGA), random ones are in rx_data.mem
+
+localparam CLK_FREQ = 50e6;
+
+//-------------------------------------------------------------------
+// Clock and reset generation
+//-------------------------------------------------------------------
+bit sys_clk;
+initial forever #(1ns * (0.5 / CLK_FREQ) / 1e-9) sys_clk = ~sys_clk;
+
+bit sys_rst = 1;
+initial begin
+    repeat(3) @(negedge sys_clk);
+    sys_rst = 0;
+end
+
+//-------------------------------------------------------------------
+// FIFO models: RX data is valid the next cycle after read, TX FIFO is full randomly
+//-------------------------------------------------------------------
+logic              rxfifo_rd;
+logic [DATA_W-1:0] rxfifo_data = '0;
+logic              rxfifo_valid = 1'b0;
+logic              rxfifo_empty;
+logic [DATA_W-1:0] txfifo_data;
+logic              txfifo_wr;
+logic              txfifo_full = 1'b0;
+
+logic [7:0] rx_queue [$];
+int rx_level = 0;
+int tx_cnt = 0;
+int tx_file;
+
+assign rxfifo_empty = (rx_level == 0);
+
+always @(posedge sys_clk) begin
+    if (rxfifo_rd && (rx_level != 0)) begin
+        rxfifo_data  <= rx_queue.pop_front();
+        rxfifo_valid <= 1'b1;
+        rx_level     <= rx_level - 1;
+    end else begin
+        rxfifo_valid <= 1'b0;
+    end
+    if (txfifo_wr && !txfifo_full) begin
+        $fdisplay(tx_file, "%0d", txfifo_data);
+        tx_cnt += 1;
+    end
+    txfifo_full <= ($urandom_range(0, 3) == 0);
+end
+
+//-------------------------------------------------------------------
+// DUT
+//-------------------------------------------------------------------
+`include "raw_test.svh"
+
+//-------------------------------------------------------------------
+// Tests
+//-------------------------------------------------------------------
+`define START_TEST $display("--- Start %m ---")
+`define END_TEST   $display("--- End %m ---")
+
+task send(logic [7:0] data);
+    @(negedge sys_clk);
+    rx_queue.push_back(data);
+    rx_level += 1;
+endtask
+
+task send_cmd(logic [15:0] code, logic [31:0] data);
+    logic [63:0] cmd;
+    cmd = {8'hAA, code, data, 8'h55};
+    for (int i = 0; i < 8; i++)
+        send(cmd[i*8 +: 8]);
+endtask
+
+task wait_tx(int n);
+    int target;
+    target = tx_cnt + n;
+    wait(tx_cnt >= target);
+endtask
+
+// Host side sequence of test_*.py: every command waits for the response of the previous one
+task test_raw(output int err);
+    logic [7:0] rx_data [RX_LEN];
+    `START_TEST;
+    $readmemh("rx_data.mem", rx_data);
+    // TX test and its CRC
+    send_cmd(16'hbeef, TX_LEN - 1);
+    wait_tx(TX_LEN);
+    send_cmd(16'hc3c2, 1);
+    wait_tx(4);
+    // RX test with the incrementing pattern and its CRC
+    send_cmd(16'hcafe, RX_LEN - 1);
+    for (int i = 0; i < RX_LEN; i++)
+        send(8'(i));
+    wait_tx(1);
+    send_cmd(16'hc3c2, 0);
+    wait_tx(4);
+    // RX test with random data and its CRC
+    send_cmd(16'hcafe, RX_LEN - 1);
+    foreach (rx_data[i])
+        send(rx_data[i]);
+    wait_tx(1);
+    send_cmd(16'hc3c2, 0);
+    wait_tx(4);
+    repeat (100) @(posedge sys_clk);
+    if (tx_cnt != TX_LEN + 4 + 1 + 4 + 1 + 4) begin
+        $error("%0d bytes are sent to the host, but %0d are expected!", tx_cnt, TX_LEN + 14);
+        err += 1;
+    end
+    `END_TEST;
+endtask
+
+initial begin : main
+    int test_err;
+    tx_file = $fopen("tx_out.txt", "w");
+    wait(!sys_rst);
+    #1us;
+    test_raw(test_err);
+    $fclose(tx_file);
+    #1us;
+    if (test_err)
+        $error("!@# TEST FAILED - %0d ERRORS #@!", test_err);
+    else
+        $display("!@# TEST PASSED #@!");
+    $finish();
+end
+
+initial begin : watchdog
+    #2ms;
+    $error("!@# TEST FAILED - TIMEOUT #@!");
+    $finish();
+end
+
+endmodule
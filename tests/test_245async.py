@@ -7,8 +7,8 @@ import pytest
 from sim import Simulator, path, get_test_names
 
 
-def run_sim(cwd, defines, simtool, gui):
-    sim = Simulator(name=simtool, gui=gui, cwd=cwd)
+def make_sim(cwd, defines, simtool, gui, session=None):
+    sim = Simulator(name=simtool, gui=gui, cwd=cwd, session=session)
     tb_dir = path("tb_245async")
     tb_common_dir = path("common")
     rtl_dir = path("../src")
@@ -18,6 +18,11 @@ def run_sim(cwd, defines, simtool, gui):
     sim.sources += rtl_dir.glob('*.sv')
     sim.defines += defines
     sim.top = "tb"
+    return sim
+
+
+def run_sim(cwd, defines, simtool, gui, session=None):
+    sim = make_sim(cwd, defines, simtool, gui, session)
     sim.setup()
     sim.run()
     return sim.is_passed
@@ -35,9 +40,9 @@ def gui(pytestconfig):
 
 @pytest.mark.parametrize('testcase', ["TESTCASE=test_rx", "TESTCASE=test_tx"])
 @pytest.mark.parametrize('clock_domains', ["MULTIPLE_CLK_DOMAINS", "SINGLE_CLK_DOMAIN"])
-def test(tmp_path, testcase, clock_domains, simtool, gui):
+def test(tmp_path, testcase, clock_domains, simtool, gui, sim_session):
     defines = [testcase, clock_domains]
-    res = run_sim(tmp_path, defines, simtool, gui)
+    res = run_sim(tmp_path, defines, simtool, gui, sim_session)
     if not gui:
         assert res
 
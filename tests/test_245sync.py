@@ -7,8 +7,8 @@ import pytest
 from sim import Simulator, path, get_test_names
 
 
-def run_sim(cwd, defines, simtool, gui):
-    sim = Simulator(name=simtool, gui=gui, cwd=cwd)
+def run_sim(cwd, defines, simtool, gui, session=None):
+    sim = Simulator(name=simtool, gui=gui, cwd=cwd, session=session)
     tb_dir = path("tb_245sync")
     tb_common_dir = path("common")
     rtl_dir = path("../src")
@@ -40,7 +40,17 @@ def ignore_some_combinations(testcase, clock_domains, ft_clock, fifo_clock, data
         return True
 
 
+def clock_ratio(testcase, clock_domains, ft_clock, fifo_clock, data_width):
+    """Derived factor to cover risky clock ratios (e.g. FIFO clock is slower than FT clock) in the pairwise tier"""
+    if 'SINGLE' in clock_domains:
+        return 'same'
+    ft_freq = float(ft_clock.split('=')[-1])
+    fifo_freq = float(fifo_clock.split('=')[-1])
+    return 'fifo_slower' if fifo_freq < ft_freq else 'fifo_faster'
+
+
 @pytest.mark.uncollect_if(func=ignore_some_combinations)
+@pytest.mark.covering(factors={'clock_ratio': clock_ratio})
 @pytest.mark.parametrize('testcase', ["TESTCASE=test_rx_simple", "TESTCASE=test_rx_flow_control",
                                       "TESTCASE=test_rx_thresholds", "TESTCASE=test_tx_simple",
                                       "TESTCASE=test_tx_flow_control", "TESTCASE=test_tx_thresholds"])
@@ -49,12 +59,12 @@ def ignore_some_combinations(testcase, clock_domains, ft_clock, fifo_clock, data
                                         "FIFO_CLK_FREQ=96e6", "FIFO_CLK_FREQ=120e6"])
 @pytest.mark.parametrize('data_width', ["DATA_W=8", "DATA_W=16", "DATA_W=32"])
 @pytest.mark.parametrize('clock_domains', ["MULTIPLE_CLK_DOMAINS", "SINGLE_CLK_DOMAIN"])
-def test(tmp_path, testcase, clock_domains, ft_clock, fifo_clock, data_width, simtool, gui):
+def test(tmp_path, testcase, clock_domains, ft_clock, fifo_clock, data_width, simtool, gui, sim_session):
     defines = [testcase, clock_domains, ft_clock, fifo_clock, data_width]
     if "thresholds" in testcase:
         defines += ["TX_FIFO_SIZE=64", "TX_START_THRESHOLD=20", "TX_BURST_SIZE=16",
                     "RX_FIFO_SIZE=64", "RX_START_THRESHOLD=16", "RX_BURST_SIZE=20"]
-    res = run_sim(tmp_path if not gui else "work", defines, simtool, gui)
+    res = run_sim(tmp_path if not gui else "work", defines, simtool, gui, sim_session)
     if not gui:
         assert res
 
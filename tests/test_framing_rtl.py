@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Tests for the framing layer RTL of the DE10-Lite example against its host side (framing.py)"""
+
+import sys
+import random
+import pytest
+from sim import Simulator, path, write_memfile
+
+example_dir = path("../examples/ft2232h_de10lite")
+sys.path.insert(0, str(example_dir.resolve()))
+from framing import frame, Deframer, CTRL_CHAN, DATA_CHAN, MAX_PAYLOAD  # noqa: E402
+
+TX_DATA_LEN = 3000
+TX_CTRL_AFTER = 100
+TX_CTRL_PAYLOAD = bytes([0xC0, 0xC1, 0xC2, 0xC3])
+
+
+def rx_stream():
+    """Framed stream for the demultiplexer and the expected output events of it"""
+    rnd = random.Random(245)
+    stream = bytearray()
+    events = []
+
+    def add(chan, payload, corrupt=False):
+        framed = bytearray(frame(chan, payload))
+        if corrupt:
+            framed[-1] ^= 0xFF  # CRC of the last frame
+        stream.extend(framed)
+        for offset in range(0, len(payload), MAX_PAYLOAD) if payload else [0]:
+            chunk = payload[offset:offset + MAX_PAYLOAD]
+            events.extend(('data', chan, b) for b in chunk)
+            crc_ok = not (corrupt and offset + MAX_PAYLOAD >= len(payload))
+            events.append(('last', chan, int(crc_ok)))
+
+    stream.extend([0x00, 0x13, 0x37])  # garbage before the first frame is dropped
+    add(CTRL_CHAN, bytes([0x55, 0x00, 0xEF, 0xBE, 0x00, 0x00, 0x00, 0xAA]))
+    add(DATA_CHAN, bytes(rnd.getrandbits(8) for _ in range(2000)))  # two frames
+    add(DATA_CHAN, bytes(rnd.getrandbits(8) for _ in range(100)), corrupt=True)
+    add(CTRL_CHAN, bytes([0xA5] * 3))  # sync byte inside the payload
+    add(DATA_CHAN, b'')  # frame without payload
+    return stream, events
+
+
+def run_sim(cwd, defines, simtool, gui, session=None):
+    sim = Simulator(name=simtool, gui=gui, cwd=cwd, session=session)
+    tb_dir = path("tb_framing")
+    rtl_dir = example_dir / "hw"
+    sim.incdirs += [tb_dir, rtl_dir, cwd]
+    sim.sources += tb_dir.glob('*.sv')
+    sim.sources += [rtl_dir / "frame_demux.sv", rtl_dir / "frame_mux.sv"]
+    sim.defines += defines
+    sim.top = "tb"
+    sim.setup()
+    stream, events = rx_stream()
+    write_memfile(path(cwd) / "rx_stream.mem", stream)
+    sim.defines += ["RX_STREAM_LEN=%d" % len(stream), "TX_DATA_LEN=%d" % TX_DATA_LEN,
+                    "TX_CTRL_AFTER=%d" % TX_CTRL_AFTER]
+    sim.run()
+    return sim.is_passed, events
+
+
+@pytest.fixture
+def simtool(pytestconfig):
+    return pytestconfig.getoption("sim")
+
+
+@pytest.fixture
+def gui(pytestconfig):
+    return pytestconfig.getoption("gui")
+
+
+def test(tmp_path, simtool, gui, sim_session):
+    cwd = tmp_path if not gui else "work"
+    res, expected_events = run_sim(cwd, [], simtool, gui, sim_session)
+    if gui:
+        return
+    assert res
+
+    # frame_demux: frame() output is parsed to the same payloads, CRC is checked as binascii.crc_hqx does
+    events = []
+    for line in (path(cwd) / "demux_out.txt").read_text().split('\n'):
+        if line:
+            kind, chan, value = line.split()
+            events.append((kind, int(chan), int(value)))
+    assert events == expected_events
+
+    # frame_mux: output is parsed by Deframer without errors
+    mux_out = bytes(int(line) for line in (path(cwd) / "mux_out.txt").read_text().split())
+    deframer = Deframer()
+    frames = deframer.feed(mux_out)
+    assert deframer.crc_errors == 0 and deframer.dropped_bytes == 0
+    data = b''.join(payload for chan, payload in frames if chan == DATA_CHAN)
+    assert data == bytes(i % 256 for i in range(TX_DATA_LEN))
+    # control request came in the middle of the first data frame, so it is sent right after that frame
+    assert [(chan, len(payload)) for chan, payload in frames[:3]] == \
+        [(DATA_CHAN, MAX_PAYLOAD), (CTRL_CHAN, len(TX_CTRL_PAYLOAD)), (DATA_CHAN, MAX_PAYLOAD)]
+    assert frames[1][1] == TX_CTRL_PAYLOAD
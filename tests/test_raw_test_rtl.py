@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Tests for the raw test logic of the DE10-Lite example against its host side scripts"""
+
+import random
+import zlib
+import pytest
+from sim import Simulator, path, write_memfile
+
+example_dir = path("../examples/ft2232h_de10lite")
+
+TX_LEN = 3000
+RX_LEN = 3000
+
+
+def run_sim(cwd, defines, simtool, gui, session=None):
+    sim = Simulator(name=simtool, gui=gui, cwd=cwd, session=session)
+    tb_dir = path("tb_raw_test")
+    rtl_dir = example_dir / "hw"
+    sim.incdirs += [tb_dir, rtl_dir, cwd]
+    sim.sources += tb_dir.glob('*.sv')
+    sim.defines += defines
+    sim.top = "tb"
+    sim.setup()
+    rnd = random.Random(245)
+    rx_data = bytes(rnd.getrandbits(8) for _ in range(RX_LEN))
+    write_memfile(path(cwd) / "rx_data.mem", rx_data)
+    sim.defines += ["TX_LEN=%d" % TX_LEN, "RX_LEN=%d" % RX_LEN]
+    sim.run()
+    return sim.is_passed, rx_data
+
+
+@pytest.fixture
+def simtool(pytestconfig):
+    return pytestconfig.getoption("sim")
+
+
+@pytest.fixture
+def gui(pytestconfig):
+    return pytestconfig.getoption("gui")
+
+
+def test(tmp_path, simtool, gui, sim_session):
+    cwd = tmp_path if not gui else "work"
+    res, rx_data = run_sim(cwd, [], simtool, gui, sim_session)
+    if gui:
+        return
+    assert res
+
+    # TX test pattern is not broken by backpressure (including the last byte), CRC-32 responses are
+    # the same as zlib.crc32 and come LSB first, RX test results are 0x42 for the pattern and 0xEE otherwise
+    tx_pattern = bytes(i % 256 for i in range(TX_LEN))
+    rx_pattern = bytes(i % 256 for i in range(RX_LEN))
+    expected = (tx_pattern + zlib.crc32(tx_pattern).to_bytes(4, 'little') +
+                bytes([0x42]) + zlib.crc32(rx_pattern).to_bytes(4, 'little') +
+                bytes([0xEE]) + zlib.crc32(rx_data).to_bytes(4, 'little'))
+    tx_out = bytes(int(line) for line in (path(cwd) / "tx_out.txt").read_text().split())
+    assert tx_out == expected
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Tests for session record/replay of the DE10-Lite example (no simulator is needed)"""
+
+import sys
+import pytest
+from sim import path
+
+sys.path.insert(0, str(path("../examples/ft2232h_de10lite").resolve()))
+import trace245  # noqa: E402
+
+
+class FakeDevice:
+    """Device with scripted read results and modem status incremented on every request"""
+
+    def __init__(self, reads, tuple_read=False):
+        self.reads = list(reads)
+        self.tuple_read = tuple_read
+        self.written = []
+        self.status = 0
+
+    def read(self, n):
+        data = self.reads.pop(0)
+        # tuple read returns (length, buffer of the requested size) like ftdi1
+        return (len(data), data + bytes(n - len(data))) if self.tuple_read else data
+
+    def write(self, data):
+        self.written.append(bytes(data))
+        return len(data)
+
+    def getModemStatus(self):
+        self.status += 2
+        return self.status
+
+    def close(self):
+        pass
+
+
+def session(dev):
+    """Calls of the session and their results"""
+    return [('status', dev.getModemStatus()),
+            ('write', dev.write(b'\x55cmd\xaa')),
+            ('read', dev.read(8)),
+            ('read', dev.read(8)),  # empty, modem status is polled after it
+            ('status', dev.getModemStatus()),
+            ('read', dev.read(8)),
+            ('write', dev.write(b'')),
+            ('status', dev.getModemStatus())]
+
+
+def normalize(results):
+    return [(call, (result[0], bytes(result[1][:result[0]])) if isinstance(result, tuple) else
+             bytes(result) if call == 'read' else result) for call, result in results]
+
+
+@pytest.mark.parametrize('tuple_read', [False, True])
+def test_round_trip(tmp_path, tuple_read):
+    trace = tmp_path / 'session.trc'
+    reads = [b'\x00\x01\x02', b'', b'\x03' * 8]
+    recorder = trace245.Recorder(FakeDevice(reads, tuple_read), trace, modem_poll=True, tuple_read=tuple_read)
+    recorded = session(recorder)
+    recorder.close()
+    assert [result for call, result in recorded if call == 'status'] == [2, 6, 8]
+
+    # record layout: explicit status requests and the poll after the empty read are in call order
+    reader = trace245.TraceReader(trace)
+    assert reader.flags == trace245.MODEM_POLL
+    assert [(r.kind, r.arg, bytes(r.payload)) for r in reader] == [
+        (trace245.MODEM, 2, b''),
+        (trace245.WRITE, 5, b'\x55cmd\xaa'),
+        (trace245.READ, 8, b'\x00\x01\x02'),
+        (trace245.READ, 8, b''),
+        (trace245.MODEM, 4, b''),
+        (trace245.MODEM, 6, b''),
+        (trace245.READ, 8, b'\x03' * 8),
+        (trace245.WRITE, 0, b''),
+        (trace245.MODEM, 8, b'')]
+    reader.close()
+
+    for realtime in [False, True]:
+        replay = trace245.Replay(trace, realtime=realtime, tuple_read=tuple_read)
+        replay.setBitMode(0xff, 0x40)  # configuration calls do nothing
+        replayed = session(replay)
+        assert normalize(replayed) == normalize(recorded)
+        assert replay.modem_status == 8
+        with pytest.raises(RuntimeError, match='Trace is over'):
+            replay.read(8)
+        replay.close()
+
+
+def test_replay_errors(tmp_path):
+    trace = tmp_path / 'session.trc'
+    recorder = trace245.Recorder(FakeDevice([b'', b'\x01']), trace, modem_poll=True)
+    recorder.read(1)
+    recorder.read(1)
+    recorder.close()
+
+    replay = trace245.Replay(trace)
+    with pytest.raises(RuntimeError, match='write is called, but read is recorded'):
+        replay.write(b'\x01')
+    with pytest.raises(AttributeError):
+        replay.setLatencyTimer(2)
+    replay.close()
+
+    # polled status is consumed by the read, explicit request is a mismatch
+    replay = trace245.Replay(trace)
+    assert not replay.read(1)
+    assert replay.modem_status == 2
+    with pytest.raises(RuntimeError, match='modem is called, but read is recorded'):
+        replay.getModemStatus()
+    replay.close()
+
+    (tmp_path / 'garbage.trc').write_bytes(b'not a trace file')
+    with pytest.raises(ValueError):
+        trace245.TraceReader(tmp_path / 'garbage.trc')
+
+
+def test_attach(tmp_path):
+    class FPGA:
+        def __init__(self, dev):
+            self.dev = dev
+
+        def read(self, n):
+            return self.dev.read(n)
+
+        def write(self, data):
+            return self.dev.write(data)
+
+        def flush(self):
+            self.dev.reads.clear()
+
+    trace = tmp_path / 'session.trc'
+    fpga = FPGA(FakeDevice([b'\x2a']))
+    recorder = trace245.attach(fpga, record=trace)
+    assert fpga.write(b'\x01\x02') == 2 and fpga.read(4) == b'\x2a'
+    recorder.close()
+    assert trace245.attach(FPGA(None)) is None
+
+    fpga = FPGA(None)  # no device on replay
+    replay = trace245.attach(fpga, replay=trace)
+    fpga.flush()
+    assert fpga.write(b'\x01\x02') == 2 and bytes(fpga.read(4)) == b'\x2a'
+    replay.close()
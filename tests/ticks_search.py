@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Search for minimal READ_TICKS and WRITE_TICKS of proto245a.
+
+For every FT clock frequency each parameter is bisected down to the minimal
+value, which still passes the related tb_245async testcase (with FT245 timing
+checks enabled in the interface model) in both clock domain modes.
+Throughput is calculated from the RD#/WR# strobe period measured by the model
+(the worst of the clock domain modes). Simulations for different frequencies
+and parameters run in parallel.
+
+Must be invoked from the tests directory, e.g.:
+
+    ./ticks_search.py --freqs 50e6 60e6 100e6 -j 8
+"""
+
+import argparse
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from test_245async import make_sim
+
+# Parameter name -> testcase, which checks it
+TESTCASES = {'READ_TICKS': 'test_rx', 'WRITE_TICKS': 'test_tx'}
+CLOCK_DOMAINS = ["MULTIPLE_CLK_DOMAINS", "SINGLE_CLK_DOMAIN"]
+
+# Strobe, which period is measured by the testcase
+STROBES = {'READ_TICKS': 'RD#', 'WRITE_TICKS': 'WR#'}
+DATA_W = 8  # tb_245async default
+
+
+def strobe_period(stdout, strobe):
+    """Strobe period in ns reported by tb_245async or None"""
+    m = re.search(r'%s (\d+(?:\.\d+)?) ns' % strobe, stdout)
+    return float(m.group(1)) if m and float(m.group(1)) > 0 else None
+
+
+def mbps(period):
+    """Throughput in MB/s for the strobe period in ns"""
+    return (DATA_W // 8) / (period * 1e-9) / 1e6
+
+
+class TicksSearch:
+    """Bisection of one parameter for one FT clock frequency"""
+
+    def __init__(self, param, ft_clk_freq, max_ticks, simtool, workdir):
+        self.param = param
+        self.ft_clk_freq = ft_clk_freq
+        self.max_ticks = max_ticks
+        self.simtool = simtool
+        self.workdir = Path(workdir)
+        self.periods = {}  # ticks -> measured strobe period in ns (the worst of the clock domain modes)
+
+    def is_passed(self, ticks):
+        """Check that all the clock domain modes pass with the ticks value"""
+        periods = []
+        for clock_domains in CLOCK_DOMAINS:
+            cwd = self.workdir / ('%s_%s_%d_%s' % (self.ft_clk_freq, self.param, ticks, clock_domains))
+            defines = ["TESTCASE=%s" % TESTCASES[self.param], clock_domains,
+                       "FT_CLK_FREQ=%s" % self.ft_clk_freq, "%s=%d" % (self.param, ticks)]
+            sim = make_sim(cwd, defines, self.simtool, gui=False)
+            sim.setup()
+            try:
+                sim.run()
+            except RuntimeError:
+                return False
+            if not sim.is_passed:
+                return False
+            periods.append(strobe_period(sim.stdout, STROBES[self.param]))
+        self.periods[ticks] = None if None in periods else max(periods)
+        return True
+
+    def run(self):
+        """Return minimal passing value or None if even max_ticks fails"""
+        if not self.is_passed(self.max_ticks):
+            return None
+        lo, hi = 0, self.max_ticks  # lo fails (or is not valid), hi passes
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self.is_passed(mid):
+                hi = mid
+            else:
+                lo = mid
+        return hi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sim', default='modelsim', help="simulator tool")
+    parser.add_argument('--freqs', nargs='+', default=['50e6', '60e6', '80e6', '100e6'],
+                        help="FT clock frequencies to check")
+    parser.add_argument('--max-ticks', type=int, default=4, help="upper bound of the search (should pass)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="number of parallel searches")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='ticks_search_') as workdir:
+        searches = [TicksSearch(param, freq, args.max_ticks, args.sim, workdir)
+                    for freq in args.freqs for param in TESTCASES.keys()]
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(executor.map(lambda search: search.run(), searches))
+
+    best = {(search.ft_clk_freq, search.param): ticks for search, ticks in zip(searches, results)}
+    periods = {(search.ft_clk_freq, search.param): search.periods.get(ticks)
+               for search, ticks in zip(searches, results)}
+    print("%-12s %-10s %-11s %-9s %s" % ('FT_CLK_FREQ', 'READ_TICKS', 'WRITE_TICKS', 'READ MB/s', 'WRITE MB/s'))
+    for freq in args.freqs:
+        row = [freq]
+        for param in TESTCASES.keys():
+            ticks = best[(freq, param)]
+            row.append('fail' if ticks is None else str(ticks))
+        for param in TESTCASES.keys():
+            period = periods[(freq, param)]
+            row.append('-' if period is None else '%.2f' % mbps(period))
+        print(("%-12s %-10s %-11s %-9s %-10s" % tuple(row)).rstrip())
+
+
+if __name__ == '__main__':
+    main()